@@ -0,0 +1,66 @@
+from bisect import bisect_right
+
+
+class BadgeRule:
+    """Award `name` once `metric` reaches `threshold`. `bit` is the badge's slot in UserProgress.badge_mask."""
+
+    __slots__ = ("bit", "name", "metric", "threshold")
+
+    def __init__(self, bit, name, metric, threshold):
+        self.bit = bit
+        self.name = name
+        self.metric = metric
+        self.threshold = threshold
+
+
+class BadgeEngine:
+    """Sorted thresholds per metric, so an update only looks at the thresholds it crossed."""
+
+    def __init__(self, rules):
+        bits = [rule.bit for rule in rules]
+        if len(set(bits)) != len(bits) or any(not 0 <= bit < 63 for bit in bits):
+            raise ValueError("Badge bits must be unique and fit in a BIGINT mask")
+
+        self.rules = tuple(rules)
+        self._by_name = {rule.name: rule for rule in rules}
+        self._by_metric = {}
+        for rule in sorted(rules, key=lambda r: r.threshold):
+            thresholds, metric_rules = self._by_metric.setdefault(rule.metric, ([], []))
+            thresholds.append(rule.threshold)
+            metric_rules.append(rule)
+
+    def newly_earned(self, old, new, mask):
+        """Rules crossed going from `old` to `new` metric values that aren't in `mask` yet.
+
+        `old` may omit metrics that aren't monotonic (e.g. streaks); those are checked
+        against every threshold up to the new value, and the mask filters repeats.
+        """
+        earned = []
+        for metric, (thresholds, rules) in self._by_metric.items():
+            value = new.get(metric)
+            if value is None:
+                continue
+            hi = bisect_right(thresholds, value)
+            lo = bisect_right(thresholds, old[metric]) if old.get(metric) is not None else 0
+            earned.extend(rule for rule in rules[lo:hi] if not mask >> rule.bit & 1)
+        return earned
+
+    def mask_for(self, badge_names):
+        mask = 0
+        for name in badge_names:
+            rule = self._by_name.get(name)
+            if rule is not None:
+                mask |= 1 << rule.bit
+        return mask
+
+
+# 🎯 Badge rules. Never reuse a bit: it is persisted in user_progress.badge_mask.
+# metric is one of: "xp", "lessons_completed", "streak_count"
+BADGE_RULES = [
+    BadgeRule(0, "Beginner Badge 🥉", "xp", 100),
+    BadgeRule(1, "Intermediate Badge 🥈", "xp", 250),
+    BadgeRule(2, "Advanced Badge 🥇", "xp", 500),
+    BadgeRule(3, "Expert Badge 🏆", "xp", 1000),
+]
+
+badge_engine = BadgeEngine(BADGE_RULES)
@@ -0,0 +1,396 @@
+"""Mixed-workload load test: boots main.app against a local database, seeds it, and drives
+signup/login, generate, complete_chapter bursts and dashboard reads from concurrent virtual users.
+
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.load_test --duration 30 --concurrency 50
+    DATABASE_URL=postgresql://postgres@localhost/finlearn_bench python -m benchmarks.load_test --save-baseline
+    DATABASE_URL=... python -m benchmarks.load_test --url http://localhost:8000 --no-seed    # a running server
+
+Reports p50/p95/p99 latency, throughput and DB queries per request for every endpoint, then compares
+against the stored baseline (benchmarks/load_baseline.json) and exits 1 if p95 or query counts regress
+by more than --tolerance. Query counts are only available in-process.
+
+Destructive: the seed step wipes every table. Point DATABASE_URL at a scratch database.
+Needs httpx (pip install httpx).
+"""
+import argparse
+import asyncio
+import contextvars
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+import httpx
+import sqlalchemy as sa
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "load_baseline.json")
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_PASSWORD = "bench-password"
+LEVELS = ("Beginner", "Intermediate", "Advanced")
+DEFAULT_MIX = "dashboard=6,complete=3,generate=2,signup=1"
+
+# Queries issued while serving the request that set this (in-process mode only)
+_query_counter = contextvars.ContextVar("query_counter", default=None)
+
+
+def count_query(conn, cursor, statement, parameters, context, executemany):
+    counter = _query_counter.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def require_local_database(url):
+    host = urlsplit(url).hostname
+    if not url.startswith("sqlite") and host not in ("localhost", "127.0.0.1", "::1"):
+        sys.exit(f"Refusing to wipe a non-local database ({host}); point DATABASE_URL at a scratch database.")
+
+
+# 🌱 Seeding
+def seed(engine, catalog, users, paths_per_user, chapters_per_user):
+    from credentials import hash_password
+    from models import Base
+
+    password = hash_password(BENCH_PASSWORD)  # hashed once; every seeded user shares it
+    topics = list(catalog)
+    tables = Base.metadata.tables
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+
+        conn.execute(tables["catalog_documents"].insert(), [
+            {"content_hash": t.content_hash, "topic": t.name, "document": t.path} for t in topics
+        ])
+        # No explicit ids, so Postgres' sequence stays ahead of them for the signup scenario
+        conn.execute(tables["users"].insert(), [
+            {"email": f"bench{n}@example.com", "username": f"bench{n}", "password": password}
+            for n in range(1, users + 1)
+        ])
+        user_ids = conn.execute(sa.select(tables["users"].c.id)).scalars().all()
+
+        path_rows = [
+            {"user_id": u, "path_name": f"Custom Path for {t.name}", "catalog_hash": t.content_hash}
+            for u in user_ids
+            for t in random.sample(topics, min(paths_per_user, len(topics)))
+        ]
+        conn.execute(tables["learning_paths"].insert(), path_rows)
+        by_id = defaultdict(list)
+        for path_id, user_id in conn.execute(sa.select(tables["learning_paths"].c.id, tables["learning_paths"].c.user_id)):
+            by_id[user_id].append(path_id)
+
+        chapters = []
+        for u in user_ids:
+            seen = set()
+            for _ in range(chapters_per_user):
+                seen.add((random.choice(by_id[u]), random.randint(1, 5), random.randint(1, 4), random.choice(LEVELS)))
+            chapters.extend(
+                {"user_id": u, "learning_path_id": p, "step_number": s, "chapter_number": c, "experience_level": lvl}
+                for p, s, c, lvl in seen
+            )
+        conn.execute(tables["user_chapter_progress"].insert(), chapters)
+
+        per_user = defaultdict(int)
+        for row in chapters:
+            per_user[row["user_id"]] += 1
+        conn.execute(tables["user_progress"].insert(), [
+            {"user_id": u, "xp": n * 20, "lessons_completed": n, "streak_count": 0} for u, n in per_user.items()
+        ])
+
+    # Same GROUP BY as `manage.py rebuild-summaries`
+    from manage import rebuild_summaries
+    rebuild_summaries(None)
+    return existing_paths(engine)
+
+
+def upgrade_schema():
+    from alembic import command
+    from alembic.config import Config
+
+    command.upgrade(Config(os.path.join(BACKEND_DIR, "alembic.ini")), "head")
+
+
+# 📊 Measurements
+class Stats:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.queries = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    async def call(self, client, label, method, url, **kwargs):
+        counter = [0]
+        token = _query_counter.set(counter)
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.errors[label] += 1
+            return None
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            _query_counter.reset(token)
+        self.latencies[label].append(elapsed)
+        self.queries[label].append(counter[0])
+        if response.status_code >= 500 or response.status_code in (401, 403):
+            self.errors[label] += 1
+        return response
+
+    def report(self, seconds, count_queries):
+        results = {}
+        for label, samples in sorted(self.latencies.items()):
+            cuts = statistics.quantiles(samples, n=100, method="inclusive") if len(samples) > 1 else samples * 99
+            results[label] = {
+                "requests": len(samples),
+                "rps": round(len(samples) / seconds, 1),
+                "p50_ms": round(cuts[49], 2),
+                "p95_ms": round(cuts[94], 2),
+                "p99_ms": round(cuts[98], 2),
+                "queries": round(statistics.fmean(self.queries[label]), 2) if count_queries else None,
+                "errors": self.errors[label],
+            }
+        return results
+
+
+# 🚀 Scenarios: each is one user action, possibly several requests
+class VirtualUser:
+    def __init__(self, client, stats, user_id, token, path_ids, topics):
+        self.client = client
+        self.stats = stats
+        self.user_id = user_id
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.path_ids = path_ids
+        self.topics = topics
+
+    async def dashboard(self):
+        u = self.user_id
+        for label, url in (
+            ("GET /progress/{user_id}", f"/progress/{u}"),
+            ("GET /progress/badges/{user_id}", f"/progress/badges/{u}"),
+            ("GET /progress/summary/{user_id}", f"/progress/summary/{u}"),
+            ("GET /learning_path/my_paths/{user_id}?summary", f"/learning_path/my_paths/{u}?summary=true&limit=20"),
+            ("GET /leaderboard/global", "/leaderboard/global?limit=10"),
+        ):
+            await self.stats.call(self.client, label, "GET", url, headers=self.headers)
+
+    async def complete(self):
+        if not self.path_ids:
+            return
+        path_id = random.choice(self.path_ids)
+        level = random.choice(LEVELS)
+        for _ in range(5):  # a burst, like finishing a step's chapters back to back
+            await self.stats.call(
+                self.client, "POST /progress/complete_chapter", "POST",
+                f"/progress/complete_chapter/{self.user_id}/{path_id}/{random.randint(1, 5)}/{random.randint(1, 4)}",
+                json={"experience_level": level}, headers=self.headers,
+            )
+
+    async def generate(self):
+        response = await self.stats.call(
+            self.client, "POST /learning_path/generate/{user_id}", "POST", f"/learning_path/generate/{self.user_id}",
+            json={"user_goal": random.choice(self.topics)}, headers=self.headers,
+        )
+        if response is not None and response.status_code == 200 and len(self.path_ids) < 50:
+            # The new path's id isn't in the response; the most recent page has it
+            page = await self.client.get(f"/learning_path/my_paths/{self.user_id}?summary=true&limit=1", headers=self.headers)
+            if page.status_code == 200 and page.json():
+                self.path_ids.append(page.json()[0]["id"])
+
+    async def signup(self):
+        name = f"load{os.getpid()}x{random.getrandbits(40):x}"
+        email = f"{name}@example.com"
+        await self.stats.call(self.client, "POST /auth/signup", "POST", "/auth/signup",
+                              json={"email": email, "username": name, "password": BENCH_PASSWORD})
+        await self.stats.call(self.client, "POST /auth/login", "POST", "/auth/login",
+                              params={"email": email, "password": BENCH_PASSWORD})
+
+
+def parse_mix(mix):
+    scenarios, weights = [], []
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if not hasattr(VirtualUser, name.strip()):
+            sys.exit(f"Unknown scenario {name!r}")
+        scenarios.append(name.strip())
+        weights.append(float(weight or 1))
+    return scenarios, weights
+
+
+async def login(client, email):
+    response = await client.post("/auth/login", params={"email": email, "password": BENCH_PASSWORD})
+    response.raise_for_status()
+    return response.json()["user_id"], response.json()["token"]
+
+
+async def check_pagination(client, user):
+    """Walk /my_paths one row per page via X-Next-Cursor; it must match the unpaginated list."""
+    url = f"/learning_path/my_paths/{user.user_id}?summary=true"
+    expected = await client.get(url, headers=user.headers)
+    expected.raise_for_status()
+    ids, pages, cursor = [], 0, None
+    while True:
+        page = await client.get(url + "&limit=1", params={"cursor": cursor} if cursor else None, headers=user.headers)
+        page.raise_for_status()
+        ids.extend(row["id"] for row in page.json())
+        pages += 1
+        cursor = page.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    if ids != [row["id"] for row in expected.json()] or (len(ids) > 1 and pages < 2):
+        sys.exit(f"/my_paths pagination mismatch for user {user.user_id}: {ids} over {pages} pages")
+
+
+async def drive(client, args, paths, topics):
+    stats = Stats()
+    scenarios, weights = parse_mix(args.mix)
+    emails = random.sample(sorted(paths), min(args.concurrency, len(paths)))
+    logins = await asyncio.gather(*(login(client, email) for email in emails))
+    users = [VirtualUser(client, stats, u, t, list(paths[email]), topics) for email, (u, t) in zip(emails, logins)]
+    await check_pagination(client, max(users, key=lambda user: len(user.path_ids)))
+
+    async def run(user, deadline):
+        while time.monotonic() < deadline:
+            await getattr(user, random.choices(scenarios, weights)[0])()
+
+    if args.warmup:
+        await asyncio.gather(*(run(user, time.monotonic() + args.warmup) for user in users))
+        stats = Stats()
+        for user in users:
+            user.stats = stats
+    start = time.monotonic()
+    await asyncio.gather(*(run(user, start + args.duration) for user in users))
+    return stats, time.monotonic() - start
+
+
+# 📋 Output
+def print_report(results, baseline):
+    print(f"\n{'endpoint':<48}{'reqs':>7}{'rps':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'queries':>9}{'errors':>8}  (ms)")
+    for label, r in results.items():
+        queries = "-" if r["queries"] is None else f"{r['queries']:.1f}"
+        line = f"{label:<48}{r['requests']:>7}{r['rps']:>8.1f}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}{queries:>9}{r['errors']:>8}"
+        base = baseline.get(label)
+        if base:
+            line += f"   p95 {pct_change(base['p95_ms'], r['p95_ms']):+.0f}%"
+        print(line)
+
+
+def pct_change(before, after):
+    return (after - before) * 100.0 / before if before else 0.0
+
+
+def regressions(results, baseline, tolerance):
+    found = []
+    for label, r in results.items():
+        base = baseline.get(label)
+        if not base:
+            continue
+        if pct_change(base["p95_ms"], r["p95_ms"]) > tolerance:
+            found.append(f"{label}: p95 {base['p95_ms']:.1f} -> {r['p95_ms']:.1f} ms")
+        if r["queries"] is not None and base.get("queries") is not None and r["queries"] > base["queries"] + 0.01:
+            found.append(f"{label}: queries/request {base['queries']:.1f} -> {r['queries']:.1f}")
+    return found
+
+
+async def run_in_process(args):
+    from database import async_engine, engine
+    from catalog import catalog_store
+    from main import app, lifespan
+
+    catalog = catalog_store.current
+
+    for target in (engine, async_engine.sync_engine):
+        sa.event.listen(target, "before_cursor_execute", count_query)
+
+    if args.seed:
+        print(f"Seeding {args.users:,} users...")
+        paths = seed(engine, catalog, args.users, args.paths_per_user, args.chapters_per_user)
+    else:
+        paths = existing_paths(engine)
+
+    transport = httpx.ASGITransport(app=app)
+    async with lifespan(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            return await drive(client, args, paths, catalog.names)
+
+
+async def run_remote(args):
+    from catalog import catalog_store
+    from database import engine
+
+    catalog = catalog_store.current
+
+    paths = seed(engine, catalog, args.users, args.paths_per_user, args.chapters_per_user) if args.seed else existing_paths(engine)
+    async with httpx.AsyncClient(base_url=args.url, timeout=30) as client:
+        return await drive(client, args, paths, catalog.names)
+
+
+def existing_paths(engine):
+    paths = defaultdict(list)
+    with engine.connect() as conn:
+        rows = conn.execute(sa.text(
+            "SELECT u.email, p.id FROM users u JOIN learning_paths p ON p.user_id = u.id "
+            "WHERE u.email LIKE 'bench%@example.com'"
+        ))
+        for email, path_id in rows:
+            paths[email].append(path_id)
+    if not paths:
+        sys.exit("No seeded bench users found; run once without --no-seed.")
+    return dict(paths)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="load-test a running server instead of booting main.app in-process")
+    parser.add_argument("--duration", type=float, default=30, help="seconds of measured load")
+    parser.add_argument("--warmup", type=float, default=5, help="seconds of unmeasured load first")
+    parser.add_argument("--concurrency", type=int, default=50, help="virtual users")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"scenario weights (default {DEFAULT_MIX})")
+    parser.add_argument("--users", type=int, default=2000, help="users to seed")
+    parser.add_argument("--paths-per-user", type=int, default=3)
+    parser.add_argument("--chapters-per-user", type=int, default=40)
+    parser.add_argument("--no-seed", dest="seed", action="store_false", help="reuse the bench users already in the database")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=20, help="allowed p95 regression, percent")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    if "DATABASE_URL" not in os.environ:
+        sys.exit("Set DATABASE_URL to a scratch database; this benchmark wipes every table.")
+    from database import DATABASE_URL
+    require_local_database(DATABASE_URL)
+    if args.seed:
+        upgrade_schema()
+
+    stats, seconds = asyncio.run(run_remote(args) if args.url else run_in_process(args))
+    results = stats.report(seconds, count_queries=not args.url)
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["endpoints"]
+    total = sum(r["requests"] for r in results.values())
+    print(f"{total:,} requests in {seconds:.1f}s ({total / seconds:.0f} req/s), {args.concurrency} virtual users")
+    print_report(results, baseline)
+
+    document = {"mix": args.mix, "concurrency": args.concurrency, "duration": args.duration, "endpoints": results}
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(document, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(document, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+        return
+
+    found = regressions(results, baseline, args.tolerance)
+    if found:
+        print("\nRegressions against baseline:")
+        for line in found:
+            print(f"  {line}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Login throughput with the configured hashing parameters (PASSWORD_SCHEME, SCRYPT_*, ARGON2_*).
+
+    python -m benchmarks.password_hashing --seconds 5
+
+Reports verifies/sec on one core, then through the bounded HashingPool with
+HASH_WORKERS threads, so the parameters can be tuned against a login budget.
+No database needed.
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from credentials import HashingPool, PASSWORD_SCHEME, hash_password, verify_password
+
+
+def single_core(stored, seconds):
+    done = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        verify_password("correct horse battery staple", stored)
+        done += 1
+    return done / (time.perf_counter() - start)
+
+
+async def pooled(stored, seconds, workers, concurrency):
+    pool = HashingPool(workers=workers, queue_limit=concurrency)
+    done = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+
+    async def client():
+        nonlocal done
+        while time.perf_counter() < deadline:
+            await pool.run(verify_password, "correct horse battery staple", stored)
+            done += 1
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    # Verifies still in flight at the deadline finish (and count) after it, so divide by the real time
+    elapsed = time.perf_counter() - start
+    stats = pool.stats()
+    pool.shutdown()
+    return done / elapsed, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--workers", type=int, default=int(os.getenv("HASH_WORKERS", str(os.cpu_count() or 1))))
+    parser.add_argument("--concurrency", type=int, default=64, help="simultaneous login attempts")
+    args = parser.parse_args()
+
+    stored = hash_password("correct horse battery staple")
+    print(f"scheme={PASSWORD_SCHEME} hash={stored[:40]}...")
+
+    per_core = single_core(stored, args.seconds)
+    print(f"single core:          {per_core:8.1f} logins/sec ({1000 / per_core:.1f} ms each)")
+
+    total, stats = asyncio.run(pooled(stored, args.seconds, args.workers, args.concurrency))
+    print(f"pool ({args.workers} workers):    {total:8.1f} logins/sec ({total / args.workers:.1f} per worker)")
+    print(f"max pending: {stats['max_pending']}, avg latency incl. queueing: {stats['avg_ms']} ms")
+
+
+if __name__ == "__main__":
+    main()
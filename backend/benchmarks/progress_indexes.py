@@ -0,0 +1,140 @@
+"""Seed ~1M chapter rows and time the progress lookups before and after 0003_progress_indexes.
+
+    DATABASE_URL=postgresql://postgres@localhost/finlearn_bench python -m benchmarks.progress_indexes
+
+Destructive: it migrates the database to 0002, wipes the progress tables, reseeds them,
+then upgrades to 0003. Point DATABASE_URL at a scratch database (SQLite works too).
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+import sqlalchemy as sa
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+
+BEFORE = "0002_catalog_documents"
+AFTER = "0003_progress_indexes"
+CHAPTERS_PER_USER = 100
+CHUNK = 10_000
+
+# Table shapes as of BEFORE, independent of whatever models.py looks like today
+users = sa.table("users", sa.column("id"), sa.column("email"), sa.column("username"), sa.column("password"))
+user_progress = sa.table("user_progress", sa.column("user_id"), sa.column("xp"), sa.column("lessons_completed"), sa.column("streak_count"))
+user_badges = sa.table("user_badges", sa.column("user_id"), sa.column("badge_name"))
+learning_paths = sa.table("learning_paths", sa.column("user_id"), sa.column("path_name"))
+user_chapter_progress = sa.table(
+    "user_chapter_progress",
+    sa.column("user_id"),
+    sa.column("learning_path_id"),
+    sa.column("step_number"),
+    sa.column("chapter_number"),
+    sa.column("experience_level"),
+)
+
+QUERIES = {
+    "chapter_exists": (
+        "SELECT id FROM user_chapter_progress WHERE user_id = :u AND learning_path_id = :p"
+        " AND step_number = :s AND chapter_number = :c AND experience_level = 'Beginner'"
+    ),
+    "completed_by_user": "SELECT learning_path_id, step_number, chapter_number FROM user_chapter_progress WHERE user_id = :u",
+    "progress_by_user": "SELECT xp FROM user_progress WHERE user_id = :u",
+    "badges_by_user": "SELECT badge_name FROM user_badges WHERE user_id = :u",
+    "paths_by_user": "SELECT id, path_name FROM learning_paths WHERE user_id = :u ORDER BY created_at DESC, id DESC LIMIT 20",
+}
+
+
+def chunked(rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == CHUNK:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def seed(engine, rows):
+    user_count = max(1, rows // CHAPTERS_PER_USER)
+    with engine.begin() as conn:
+        for table in ("user_chapter_progress", "user_badges", "learning_paths", "user_progress", "users"):
+            conn.execute(sa.text(f"DELETE FROM {table}"))
+
+        for batch in chunked({"id": u, "email": f"bench{u}@example.com", "username": f"bench{u}", "password": "x"} for u in range(1, user_count + 1)):
+            conn.execute(users.insert(), batch)
+        conn.execute(user_progress.insert(), [{"user_id": u, "xp": 0, "lessons_completed": 0, "streak_count": 0} for u in range(1, user_count + 1)])
+        conn.execute(user_badges.insert(), [{"user_id": u, "badge_name": "Beginner Badge 🥉"} for u in range(1, user_count + 1)])
+        conn.execute(learning_paths.insert(), [{"user_id": u, "path_name": "bench"} for u in range(1, user_count + 1) for _ in range(3)])
+
+        chapters = (
+            {
+                "user_id": u,
+                "learning_path_id": i // 10,
+                "step_number": (i // 2) % 5 + 1,
+                "chapter_number": i % 2 + 1,
+                "experience_level": "Beginner",
+            }
+            for u in range(1, user_count + 1)
+            for i in range(CHAPTERS_PER_USER)
+        )
+        for batch in chunked(chapters):
+            conn.execute(user_chapter_progress.insert(), batch)
+    return user_count
+
+
+def measure(engine, user_count, samples):
+    results = {}
+    with engine.connect() as conn:
+        conn.execute(sa.text("ANALYZE"))
+        for name, sql in QUERIES.items():
+            statement = sa.text(sql)
+            timings = []
+            for _ in range(samples):
+                i = random.randrange(CHAPTERS_PER_USER)
+                params = {"u": random.randint(1, user_count), "p": i // 10, "s": (i // 2) % 5 + 1, "c": i % 2 + 1}
+                start = time.perf_counter()
+                conn.execute(statement, params).fetchall()
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            results[name] = (statistics.median(timings), timings[int(len(timings) * 0.95) - 1])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="user_chapter_progress rows to seed")
+    parser.add_argument("--samples", type=int, default=200, help="timed executions per query")
+    args = parser.parse_args()
+
+    if "DATABASE_URL" not in os.environ:
+        sys.exit("Set DATABASE_URL to a scratch database; this benchmark wipes the progress tables.")
+
+    from database import engine
+
+    config = Config(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini"))
+    with engine.connect() as conn:
+        current = MigrationContext.configure(conn).get_current_revision()
+    if current in (None, "0001_initial"):
+        command.upgrade(config, BEFORE)
+    elif current != BEFORE:
+        command.downgrade(config, BEFORE)
+
+    print(f"Seeding {args.rows:,} chapter rows...")
+    user_count = seed(engine, args.rows)
+    before = measure(engine, user_count, args.samples)
+
+    command.upgrade(config, AFTER)
+    after = measure(engine, user_count, args.samples)
+
+    print(f"\n{'query':<20}{'before p50':>12}{'before p95':>12}{'after p50':>12}{'after p95':>12}  (ms)")
+    for name in QUERIES:
+        print(f"{name:<20}{before[name][0]:>12.3f}{before[name][1]:>12.3f}{after[name][0]:>12.3f}{after[name][1]:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
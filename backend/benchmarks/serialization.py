@@ -0,0 +1,111 @@
+"""Per-endpoint serialization cost: FastAPI's default jsonable_encoder + JSONResponse
+path (before) against the response models / orjson / cached catalog bytes (after).
+
+    python -m benchmarks.serialization --number 2000
+
+Pure CPU, no database or server needed.
+"""
+import argparse
+import json
+import timeit
+from datetime import datetime, timezone
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from models import UserBadges, UserProgress
+from catalog import catalog_store, read_document
+from routers.learning_path import _path_row_bytes
+from schemas import BadgeOut, CompletedChapterOut, ProgressOut
+
+NOW = datetime.now(timezone.utc)
+
+
+def json_response_body(content):
+    # What fastapi.responses.JSONResponse.render does after jsonable_encoder
+    return json.dumps(jsonable_encoder(content), ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def legacy_generate(raw_steps):
+    fixed_path = []
+    for step in raw_steps:
+        new_step = step.copy()
+        if "quizzes" in new_step:
+            new_step["quiz"] = []
+            for quiz_set in new_step["quizzes"]:
+                new_step["quiz"].extend(quiz_set["questions"])
+            del new_step["quizzes"]
+        fixed_path.append(new_step)
+    return json_response_body({"message": "Learning path generated!", "path": fixed_path})
+
+
+class PathRow:
+    def __init__(self, i, topic):
+        self.id = i
+        self.user_id = 1
+        self.path_name = f"Custom Path for {topic.name}"
+        self.catalog_hash = topic.content_hash
+        self.created_at = NOW
+        self.path_json = None
+
+
+def cases():
+    catalog = catalog_store.current
+    topic = catalog.get(catalog.names[0])
+    raw_steps = read_document(catalog.files[topic.name][0])
+    progress = UserProgress(id=1, user_id=1, xp=420, lessons_completed=21, streak_count=3, last_lesson_date=NOW, badge_mask=3)
+    badges = [UserBadges(id=i, user_id=1, badge_name=f"Badge {i}", earned_at=NOW) for i in range(4)]
+    completed = [
+        {"path_id": i // 10, "step": (i // 2) % 5 + 1, "chapter": i % 2 + 1, "experience_level": "Beginner"}
+        for i in range(300)
+    ]
+    rows = [PathRow(i, topic) for i in range(20)]
+    documents = {topic.content_hash: topic.path_bytes}
+    legacy_paths = [
+        {"id": r.id, "user_id": r.user_id, "path_name": r.path_name, "path_json": topic.path, "created_at": r.created_at}
+        for r in rows
+    ]
+
+    progress_adapter = TypeAdapter(ProgressOut)
+    badges_adapter = TypeAdapter(List[BadgeOut])
+    completed_adapter = TypeAdapter(List[CompletedChapterOut])
+
+    return {
+        "GET /progress/{id}": (
+            lambda: json_response_body(progress),
+            lambda: progress_adapter.dump_json(progress_adapter.validate_python(progress, from_attributes=True)),
+        ),
+        "GET /progress/badges/{id}": (
+            lambda: json_response_body(badges),
+            lambda: badges_adapter.dump_json(badges_adapter.validate_python(badges, from_attributes=True)),
+        ),
+        "GET /progress/completed/{id}": (
+            lambda: json_response_body(completed),
+            lambda: completed_adapter.dump_json(completed_adapter.validate_python(completed)),
+        ),
+        "POST /learning_path/generate": (
+            lambda: legacy_generate(raw_steps),
+            lambda: topic.response_body("Learning path generated!"),
+        ),
+        "GET /learning_path/my_paths (20)": (
+            lambda: json_response_body(legacy_paths),
+            lambda: b"[" + b",".join(_path_row_bytes(r, documents) for r in rows) + b"]",
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=2000, help="iterations per measurement")
+    args = parser.parse_args()
+
+    print(f"{'endpoint':<34}{'before µs':>12}{'after µs':>12}{'speedup':>10}")
+    for name, (before, after) in cases().items():
+        t_before = min(timeit.repeat(before, number=args.number, repeat=3)) / args.number * 1e6
+        t_after = min(timeit.repeat(after, number=args.number, repeat=3)) / args.number * 1e6
+        print(f"{name:<34}{t_before:>12.1f}{t_after:>12.1f}{t_before / t_after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import hashlib
+import os
+import secrets
+import time
+from collections import OrderedDict
+
+from fastapi import Request, Response
+
+import config  # noqa: F401  (loads .env before any setting below is read)
+from metrics import serializing
+
+# ⚙️ Cache settings
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")  # "memory" or "redis"
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "60"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+
+class LRUCache:
+    """In-process LRU with per-entry TTL, exposing the async get/set/delete subset of a Redis client."""
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    async def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key, value, ex=None):
+        self._entries[key] = (value, time.monotonic() + ex if ex else None)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, *keys):
+        return sum(self._entries.pop(key, None) is not None for key in keys)
+
+
+def build_cache():
+    if CACHE_BACKEND == "redis":
+        # Optional dependency, only needed when CACHE_BACKEND=redis
+        import redis.asyncio as redis
+        return redis.from_url(REDIS_URL)
+    return LRUCache()
+
+
+# Anything with async get / set(ex=) / delete works here, e.g. a fake Redis in tests
+cache = build_cache()
+
+
+USER_KEY_KINDS = ("progress", "badges", "completed", "summary")
+
+# An invalidation moves the user onto a new generation instead of only deleting keys, so a read
+# that loaded its data before the write stores it under the old generation, where nothing reads it.
+# The generation outlives every entry stored under the one it replaced (builds take well under a TTL).
+GENERATION_TTL_SECONDS = 2 * CACHE_TTL_SECONDS
+
+
+def generation_key(user_id: int):
+    return f"gen:{user_id}"
+
+
+async def user_generation(user_id: int):
+    generation = await cache.get(generation_key(user_id))
+    return generation.decode() if generation is not None else "0"
+
+
+def user_keys(user_id: int, generation: str):
+    return tuple(f"{kind}:{user_id}:{generation}" for kind in USER_KEY_KINDS)
+
+
+async def invalidate_user(user_id: int):
+    stale = user_keys(user_id, await user_generation(user_id))
+    await cache.set(generation_key(user_id), secrets.token_hex(8).encode(), ex=GENERATION_TTL_SECONDS)
+    await cache.delete(*stale)
+
+
+def etag_matches(request: Request, etag: str):
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+async def cached_json(request: Request, user_id: int, kind: str, build, adapter):
+    """Serve `user_id`'s `kind` entry from the cache (building it with `await build()` on a miss)
+    with ETag / 304 support.
+
+    `adapter` is a pydantic TypeAdapter for the response model; it serializes straight to bytes.
+    """
+    key = f"{kind}:{user_id}:{await user_generation(user_id)}"
+    entry = await cache.get(key)
+    if entry is None:
+        value = await build()
+        with serializing():
+            body = adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+        etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+        await cache.set(key, etag.encode() + b" " + body, ex=CACHE_TTL_SECONDS)
+    else:
+        raw_etag, body = entry.split(b" ", 1)
+        etag = raw_etag.decode()
+
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
@@ -0,0 +1,284 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+from array import array
+
+import orjson
+
+import config  # noqa: F401  (loads .env before any setting below is read)
+from metrics import serializing
+
+logger = logging.getLogger(__name__)
+
+# ⚙️ Catalog files: index.json maps topic name -> file; one JSON (or YAML) list of steps per topic
+CATALOG_DIR = os.getenv("CATALOG_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalog_data"))
+CATALOG_RELOAD_SECONDS = float(os.getenv("CATALOG_RELOAD_SECONDS", "2"))  # 0 disables hot reload
+
+
+class FrozenDict(dict):
+    """A dict that refuses mutation but still serializes like a plain dict."""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Catalog entries are read-only")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+
+def freeze(value):
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def dump_json(value):
+    # Compact UTF-8, same bytes FastAPI's (OR)JSONResponse would produce
+    with serializing():
+        return orjson.dumps(value)
+
+
+def strip_answer(question, chapter):
+    public = {k: v for k, v in question.items() if k != "correctAnswer"}
+    public["chapter"] = chapter
+    return public
+
+
+def normalize_step(step):
+    # Frontend expects a flat "quiz" list instead of per-chapter "quizzes";
+    # answers stay server-side in the AnswerKey, each question says which chapter's quiz it is from
+    new_step = {k: v for k, v in step.items() if k not in ("quizzes", "quiz")}
+    if "quizzes" in step:
+        new_step["quiz"] = [strip_answer(q, quiz_set["chapter"]) for quiz_set in step["quizzes"] for q in quiz_set["questions"]]
+    elif "quiz" in step:
+        # Already-normalized documents (retired catalog versions stored before answers were stripped)
+        new_step["quiz"] = [{k: v for k, v in q.items() if k != "correctAnswer"} for q in step["quiz"]]
+    return new_step
+
+
+def public_path(steps):
+    """A stored path document as clients may see it: normalized, without answers."""
+    if not isinstance(steps, (list, tuple)):
+        return steps
+    return [normalize_step(step) if isinstance(step, dict) else step for step in steps]
+
+
+def chapter_counts(steps):
+    """{step number: number of chapters}, for completion percentages."""
+    return {step["step"]: len(step.get("chapters") or ()) for step in steps}
+
+
+class AnswerKey:
+    """correctAnswer of every question in a topic, packed into one byte array.
+
+    (step, chapter) -> (offset, count); question i of that quiz is answers[offset + i].
+    """
+
+    __slots__ = ("answers", "offsets")
+
+    def __init__(self, steps):
+        answers = array("B")
+        offsets = {}
+        for step in steps:
+            for quiz_set in step.get("quizzes") or ():
+                key = (step["step"], quiz_set["chapter"])
+                if key in offsets:
+                    raise ValueError(f"Two quizzes for step {key[0]}, chapter {key[1]}")
+                offsets[key] = (len(answers), len(quiz_set["questions"]))
+                answers.extend(q["correctAnswer"] for q in quiz_set["questions"])
+        self.answers = bytes(answers)
+        self.offsets = offsets
+
+    def grade(self, step, chapter, submitted):
+        """Per-question True/False, or None if there is no such quiz. O(questions), no I/O."""
+        entry = self.offsets.get((step, chapter))
+        if entry is None:
+            return None
+        offset, count = entry
+        if len(submitted) != count:
+            raise ValueError(f"Expected {count} answers, got {len(submitted)}")
+        answers = self.answers
+        return [submitted[i] == answers[offset + i] for i in range(count)]
+
+
+class CatalogTopic:
+    """One normalized topic: frozen steps plus their pre-serialized JSON."""
+
+    __slots__ = ("name", "path", "path_bytes", "content_hash", "chapter_counts", "chapter_keys", "answer_key", "_responses")
+
+    def __init__(self, name, steps):
+        self.name = name
+        self.answer_key = AnswerKey(steps)
+        self.path = freeze([normalize_step(step) for step in steps])
+        self.path_bytes = dump_json(self.path)
+        self.content_hash = hashlib.sha256(self.path_bytes).hexdigest()
+        self.chapter_counts = chapter_counts(self.path)
+        # (step, chapter) of every real chapter; quiz numbers don't always name one
+        self.chapter_keys = frozenset(
+            (step["step"], chapter["chapter"]) for step in self.path for chapter in step.get("chapters") or ()
+            if isinstance(chapter, dict) and "chapter" in chapter
+        )
+        self._responses = {}
+
+    def response_body(self, message):
+        """`{"message": ..., "path": ...}` as bytes, built once per message."""
+        body = self._responses.get(message)
+        if body is None:
+            body = b'{"message":' + dump_json(message) + b',"path":' + self.path_bytes + b"}"
+            self._responses[message] = body
+        return body
+
+
+class CatalogError(ValueError):
+    pass
+
+
+def _reject_duplicates(pairs):
+    # json.loads would silently keep the last of two equal keys
+    obj = {}
+    for key, value in pairs:
+        if key in obj:
+            raise CatalogError(f"duplicate key {key!r}")
+        obj[key] = value
+    return obj
+
+
+def _load_yaml(data, path):
+    # Optional dependency, only needed for .yaml topic files
+    import yaml
+
+    class UniqueKeyLoader(yaml.SafeLoader):
+        pass
+
+    def construct_mapping(loader, node, deep=False):
+        seen = set()
+        for key_node, _ in node.value:
+            key = loader.construct_object(key_node, deep=deep)
+            if key in seen:
+                raise CatalogError(f"{path}: duplicate key {key!r} on line {key_node.start_mark.line + 1}")
+            seen.add(key)
+        return loader.construct_mapping(node, deep=deep)
+
+    UniqueKeyLoader.add_constructor(yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, construct_mapping)
+    return yaml.load(data, Loader=UniqueKeyLoader)
+
+
+def read_document(path):
+    """Parse a catalog file, rejecting duplicate keys at any depth."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if path.endswith((".yaml", ".yml")):
+        return _load_yaml(data, path)
+    try:
+        return json.loads(data, object_pairs_hook=_reject_duplicates)
+    except CatalogError as e:
+        raise CatalogError(f"{path}: {e}") from None
+
+
+class Catalog:
+    """One immutable catalog version. Topic names come from the index; each topic file is parsed on first use."""
+
+    def __init__(self, files, loaded=None):
+        self.files = files  # name -> (path, mtime_ns)
+        self._topics = dict(loaded or {})
+        self._by_hash = {topic.content_hash: topic for topic in self._topics.values()}
+        self._lock = threading.Lock()
+        self.names = tuple(files)
+        self.invalid_topic_detail = "Invalid topic. Choose one of: " + ", ".join(self.names)
+
+    def __contains__(self, name):
+        return name in self.files
+
+    def __iter__(self):
+        return (self.get(name) for name in self.names)
+
+    def get(self, name):
+        topic = self._topics.get(name)
+        if topic is None and name in self.files:
+            with self._lock:
+                topic = self._topics.get(name)
+                if topic is None:
+                    topic = CatalogTopic(name, read_document(self.files[name][0]))
+                    self._by_hash[topic.content_hash] = topic
+                    self._topics[name] = topic
+        return topic
+
+    def by_hash(self, content_hash):
+        topic = self._by_hash.get(content_hash)
+        if topic is None and len(self._topics) < len(self.files):
+            # A hash is only known once its topic is parsed, so a miss loads the rest (once per version)
+            for name in self.names:
+                self.get(name)
+            topic = self._by_hash.get(content_hash)
+        return topic
+
+    def loaded(self, name):
+        return self._topics.get(name)
+
+
+class CatalogStore:
+    """Holds the current Catalog. A reload builds a new version and swaps it in with a single assignment,
+    so a request that already read `current` keeps a consistent version."""
+
+    def __init__(self, directory=CATALOG_DIR):
+        self.directory = directory
+        self.index_path = os.path.join(directory, "index.json")
+        self.current = Catalog(self._scan())
+        self.version = 1
+        self._seen = self._signature()
+
+    def _scan(self):
+        files = {}
+        for name, filename in read_document(self.index_path).items():
+            path = os.path.join(self.directory, filename)
+            files[name] = (path, os.stat(path).st_mtime_ns)
+        return files
+
+    @staticmethod
+    def _mtime(path):
+        # A deleted or renamed file counts as a change; reload() then reports it once
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _signature(self):
+        return self._mtime(self.index_path), tuple(self._mtime(path) for path, _ in self.current.files.values())
+
+    def changed(self):
+        return self._signature() != self._seen
+
+    def reload(self):
+        """Parse every added or edited topic before swapping; if one fails, the running version stays."""
+        self._seen = self._signature()  # a broken edit is reported once, not on every poll
+        files = self._scan()
+        old = self.current
+        loaded = {}
+        for name, source in files.items():
+            if old.files.get(name) != source:
+                loaded[name] = CatalogTopic(name, read_document(source[0]))
+            elif old.loaded(name) is not None:
+                loaded[name] = old.loaded(name)
+        self.current = Catalog(files, loaded)
+        self._seen = self._signature()
+        self.version += 1
+        return self.current
+
+
+catalog_store = CatalogStore()
+
+
+async def watch_catalog_forever(store=catalog_store):
+    """Background task: hot-reloads edited catalog files without restarting workers."""
+    while True:
+        await asyncio.sleep(CATALOG_RELOAD_SECONDS)
+        try:
+            if store.changed():
+                await asyncio.to_thread(store.reload)
+                logger.info("Catalog reloaded (version %d): %s", store.version, ", ".join(store.current.names))
+        except Exception:
+            logger.exception("Catalog reload failed, still serving version %d", store.version)
@@ -0,0 +1,4 @@
+"""Loads .env into the environment. Every module that reads settings at import time imports this first."""
+from dotenv import load_dotenv
+
+load_dotenv()
@@ -0,0 +1,155 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import config  # noqa: F401  (loads .env before any setting below is read)
+
+# ⚙️ Hashing settings
+PASSWORD_SCHEME = os.getenv("PASSWORD_SCHEME", "scrypt")  # "scrypt" or "argon2id" (needs argon2-cffi)
+SCRYPT_N = int(os.getenv("SCRYPT_N", str(2 ** 14)))
+SCRYPT_R = int(os.getenv("SCRYPT_R", "8"))
+SCRYPT_P = int(os.getenv("SCRYPT_P", "1"))
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "2"))
+ARGON2_MEMORY_KIB = int(os.getenv("ARGON2_MEMORY_KIB", "19456"))
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "1"))
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", str(os.cpu_count() or 1)))
+HASH_QUEUE_LIMIT = int(os.getenv("HASH_QUEUE_LIMIT", "256"))  # in-flight + queued before we shed load
+
+_SCRYPT_PREFIX = "$scrypt$"
+_ARGON2_PREFIX = "$argon2"
+
+_argon2_hasher = None
+if PASSWORD_SCHEME == "argon2id":
+    # Optional dependency, only needed when PASSWORD_SCHEME=argon2id
+    from argon2 import PasswordHasher, Type
+    _argon2_hasher = PasswordHasher(
+        time_cost=ARGON2_TIME_COST,
+        memory_cost=ARGON2_MEMORY_KIB,
+        parallelism=ARGON2_PARALLELISM,
+        type=Type.ID,
+    )
+
+
+def _b64(raw):
+    return base64.b64encode(raw).decode().rstrip("=")
+
+
+def _unb64(text):
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+def _scrypt(password, salt, n, r, p):
+    # maxmem must cover 128 * n * r bytes plus some slack
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, maxmem=256 * n * r + 2 ** 20, dklen=32)
+
+
+def hash_password(password: str) -> str:
+    if _argon2_hasher is not None:
+        return _argon2_hasher.hash(password)
+    salt = secrets.token_bytes(16)
+    digest = _scrypt(password, salt, SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    return f"{_SCRYPT_PREFIX}n={SCRYPT_N},r={SCRYPT_R},p={SCRYPT_P}${_b64(salt)}${_b64(digest)}"
+
+
+def is_legacy(stored: str) -> bool:
+    """Rows written before hashing existed hold the plaintext password."""
+    return not stored.startswith((_SCRYPT_PREFIX, _ARGON2_PREFIX))
+
+
+def verify_password(password: str, stored: str) -> bool:
+    if stored.startswith(_SCRYPT_PREFIX):
+        params, salt, digest = stored[len(_SCRYPT_PREFIX):].split("$")
+        cost = dict(item.split("=") for item in params.split(","))
+        candidate = _scrypt(password, _unb64(salt), int(cost["n"]), int(cost["r"]), int(cost["p"]))
+        return hmac.compare_digest(candidate, _unb64(digest))
+    if stored.startswith(_ARGON2_PREFIX):
+        from argon2 import PasswordHasher
+        from argon2.exceptions import VerificationError, InvalidHashError
+        try:
+            return (_argon2_hasher or PasswordHasher()).verify(stored, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    return hmac.compare_digest(password.encode(), stored.encode())
+
+
+_dummy_hash = None
+
+
+def verify_unknown_user(password: str) -> bool:
+    """Same work as checking a wrong password, for emails with no account; always False.
+
+    Otherwise a login for an unregistered email answers a hash-time faster and gives it away.
+    """
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = hash_password(secrets.token_urlsafe(16))  # once per process, current parameters
+    verify_password(password, _dummy_hash)
+    return False
+
+
+def needs_rehash(stored: str) -> bool:
+    if is_legacy(stored):
+        return True
+    if _argon2_hasher is not None:
+        return not stored.startswith(_ARGON2_PREFIX) or _argon2_hasher.check_needs_rehash(stored)
+    return not stored.startswith(f"{_SCRYPT_PREFIX}n={SCRYPT_N},r={SCRYPT_R},p={SCRYPT_P}$")
+
+
+class HashingPoolSaturated(Exception):
+    pass
+
+
+class HashingPool:
+    """Bounded worker pool so hashing never runs on (or floods) the event loop.
+
+    scrypt and argon2 both release the GIL while hashing, so threads scale across cores.
+    """
+
+    def __init__(self, workers=HASH_WORKERS, queue_limit=HASH_QUEUE_LIMIT):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pwhash")
+        # Only touched from the event loop thread, so no lock needed
+        self.pending = 0
+        self.max_pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.busy_seconds = 0.0
+
+    async def run(self, fn, *args):
+        if self.pending >= self.queue_limit:
+            self.rejected += 1
+            raise HashingPoolSaturated()
+        self.pending += 1
+        self.max_pending = max(self.max_pending, self.pending)
+        start = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self.pending -= 1
+            self.completed += 1
+            self.busy_seconds += time.perf_counter() - start
+
+    def stats(self):
+        return {
+            "scheme": PASSWORD_SCHEME,
+            "workers": self.workers,
+            "queue_limit": self.queue_limit,
+            "in_flight": min(self.pending, self.workers),
+            "queue_depth": max(0, self.pending - self.workers),
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_ms": round(self.busy_seconds * 1000 / self.completed, 3) if self.completed else 0.0,
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+hashing_pool = HashingPool()
@@ -0,0 +1,93 @@
+import csv
+import io
+import zlib
+
+import orjson
+from sqlalchemy import select
+
+from database import SessionLocal
+from models import UserBadges, UserChapterProgress, UserProgress
+
+EXPORT_TABLES = {
+    "chapter_progress": UserChapterProgress,
+    "progress": UserProgress,
+    "badges": UserBadges,
+}
+EXPORT_FORMATS = ("ndjson", "csv")
+YIELD_PER = 2000
+FLUSH_BYTES = 64 * 1024
+
+
+def _rows(db, model):
+    """Server-side cursor: only YIELD_PER rows are held in memory at a time."""
+    query = select(model.__table__).order_by(model.__table__.c.id)
+    result = db.execute(query.execution_options(stream_results=True, yield_per=YIELD_PER))
+    for row in result.mappings():
+        yield row
+
+
+def _ndjson(db, tables):
+    tag = len(tables) > 1
+    for name in tables:
+        for row in _rows(db, EXPORT_TABLES[name]):
+            record = dict(row)
+            if tag:
+                record["_table"] = name
+            yield orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+
+
+def _csv(db, name):
+    columns = [c.name for c in EXPORT_TABLES[name].__table__.columns]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for row in _rows(db, EXPORT_TABLES[name]):
+        writer.writerow([row[c] for c in columns])
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _batched(pieces):
+    # Fewer, larger writes: a chunk per row would dominate the cost of streaming
+    batch = []
+    size = 0
+    for piece in pieces:
+        batch.append(piece)
+        size += len(piece)
+        if size >= FLUSH_BYTES:
+            yield b"".join(batch)
+            batch = []
+            size = 0
+    if batch:
+        yield b"".join(batch)
+
+
+def _gzipped(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_stream(table: str, fmt: str = "ndjson", gzip: bool = False):
+    """Byte chunks of the export, in constant memory. `table` is a key of EXPORT_TABLES or "all" (ndjson only)."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}")
+    tables = list(EXPORT_TABLES) if table == "all" else [table]
+    if any(name not in EXPORT_TABLES for name in tables):
+        raise ValueError(f"Unknown table {table!r}")
+    if fmt == "csv" and len(tables) > 1:
+        raise ValueError("CSV exports one table at a time")
+    return _stream(tables, fmt, gzip)
+
+
+def _stream(tables, fmt, gzip):
+    with SessionLocal() as db:
+        pieces = _ndjson(db, tables) if fmt == "ndjson" else _csv(db, tables[0])
+        chunks = _batched(pieces)
+        yield from _gzipped(chunks) if gzip else chunks
@@ -0,0 +1,355 @@
+import asyncio
+import logging
+import os
+import random
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, select
+
+import config  # noqa: F401  (loads .env before any setting below is read)
+from database import dialect_insert
+from models import CatalogDocument, LeaderboardSnapshot, LearningPath, UserChapterProgress, UserProgress
+from paths import path_topic
+from sessions import unit_of_work
+
+logger = logging.getLogger(__name__)
+
+LEADERBOARD_SNAPSHOT_SECONDS = int(os.getenv("LEADERBOARD_SNAPSHOT_SECONDS", "300"))
+
+_MAX_LEVEL = 32
+
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key, level):
+        self.key = key
+        self.next = [None] * level
+        self.width = [1] * level  # level-0 steps to next[i]
+
+
+class IndexableSkipList:
+    """Sorted keys with O(log n) insert, remove, rank and index lookup."""
+
+    def __init__(self):
+        self.size = 0
+        self._nil = _Node(None, 0)
+        self._head = _Node(None, _MAX_LEVEL)
+        self._head.next = [self._nil] * _MAX_LEVEL
+
+    def __len__(self):
+        return self.size
+
+    def _path(self, key):
+        chain = [None] * _MAX_LEVEL
+        steps = [0] * _MAX_LEVEL
+        node = self._head
+        for level in reversed(range(_MAX_LEVEL)):
+            while node.next[level] is not self._nil and node.next[level].key < key:
+                steps[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+        return chain, steps
+
+    def insert(self, key):
+        chain, steps_at_level = self._path(key)
+        level_count = 1
+        while level_count < _MAX_LEVEL and random.getrandbits(1):
+            level_count += 1
+        new = _Node(key, level_count)
+        steps = 0
+        for level in range(level_count):
+            prev = chain[level]
+            new.next[level] = prev.next[level]
+            prev.next[level] = new
+            new.width[level] = prev.width[level] - steps
+            prev.width[level] = steps + 1
+            steps += steps_at_level[level]
+        for level in range(level_count, _MAX_LEVEL):
+            chain[level].width[level] += 1
+        self.size += 1
+
+    def remove(self, key):
+        chain, _ = self._path(key)
+        target = chain[0].next[0]
+        if target is self._nil or target.key != key:
+            raise KeyError(key)
+        for level in range(len(target.next)):
+            prev = chain[level]
+            prev.width[level] += target.width[level] - 1
+            prev.next[level] = target.next[level]
+        for level in range(len(target.next), _MAX_LEVEL):
+            chain[level].width[level] -= 1
+        self.size -= 1
+
+    def rank(self, key):
+        """Number of keys strictly smaller than `key`."""
+        _, steps = self._path(key)
+        return sum(steps)
+
+    def iter_from(self, index):
+        """Keys in ascending order starting at position `index`."""
+        if index >= self.size:
+            return
+        node = self._head
+        i = index + 1
+        for level in reversed(range(_MAX_LEVEL)):
+            while node.width[level] <= i:
+                i -= node.width[level]
+                node = node.next[level]
+        while node is not self._nil:
+            yield node.key
+            node = node.next[0]
+
+
+class SortedSet:
+    """In-process sorted set with the Redis ZADD/ZINCRBY/ZREVRANK/ZREVRANGE semantics we use.
+
+    Ordered by (score, member) like Redis. Calls are synchronous and the data is per worker.
+    """
+
+    def __init__(self):
+        self._scores = {}
+        self._order = IndexableSkipList()
+
+    def zadd(self, mapping):
+        added = 0
+        for member, score in mapping.items():
+            old = self._scores.get(member)
+            if old == score:
+                continue
+            if old is None:
+                added += 1
+            else:
+                self._order.remove((old, member))
+            self._scores[member] = score
+            self._order.insert((score, member))
+        return added
+
+    def zincrby(self, amount, member):
+        score = self._scores.get(member, 0) + amount
+        self.zadd({member: score})
+        return score
+
+    def zrem(self, *members):
+        removed = 0
+        for member in members:
+            score = self._scores.pop(member, None)
+            if score is not None:
+                self._order.remove((score, member))
+                removed += 1
+        return removed
+
+    def zscore(self, member):
+        return self._scores.get(member)
+
+    def zcard(self):
+        return len(self._scores)
+
+    def zrank(self, member):
+        score = self._scores.get(member)
+        return None if score is None else self._order.rank((score, member))
+
+    def zrevrank(self, member):
+        rank = self.zrank(member)
+        return None if rank is None else len(self._scores) - 1 - rank
+
+    def zrevrange(self, start, stop, withscores=False):
+        """Highest scores first; `stop` is inclusive, as in Redis."""
+        size = len(self._scores)
+        if stop < 0:
+            stop += size
+        stop = min(stop, size - 1)
+        if start > stop:
+            return []
+        keys = []
+        for key in self._order.iter_from(size - 1 - stop):
+            keys.append(key)
+            if len(keys) == stop - start + 1:
+                break
+        keys.reverse()
+        return [(member, score) for score, member in keys] if withscores else [member for _, member in keys]
+
+
+def weekly_board(now=None):
+    year, week, _ = (now or datetime.now(timezone.utc)).isocalendar()
+    return f"weekly:{year}-W{week:02d}"
+
+
+def topic_board(topic):
+    # Per topic, not per learning_paths row: every user gets their own row for the same topic
+    return f"topic:{topic}"
+
+
+GLOBAL_BOARD = "global"
+
+
+class Leaderboards:
+    """Global, per-topic and weekly boards, kept current by complete_chapter.
+
+    Boards live in each worker's memory; `board_factory` builds one (anything with the SortedSet
+    methods). A worker only sees the completions it served itself, so snapshot() also brings it up
+    to date with the others: global and topic boards are rebuilt from the DB, and weekly XP (which
+    progress rows can't rebuild) is added to the shared snapshot rows and reloaded from them.
+    """
+
+    def __init__(self, board_factory=SortedSet):
+        self.board_factory = board_factory
+        self.xp_per_chapter = None  # set by warm()
+        self.boards = {}
+        self._week = weekly_board()
+        self._unsaved = {}  # weekly board -> {user_id: XP recorded here since the last snapshot}
+
+    def board(self, name):
+        board = self.boards.get(name)
+        if board is None:
+            board = self.boards[name] = self.board_factory()
+        return board
+
+    def record(self, user_id, total_xp, topic_xp):
+        """`total_xp` is the authoritative total from the DB; `topic_xp` maps topic name -> XP just earned."""
+        self.board(GLOBAL_BOARD).zadd({user_id: total_xp})
+        week = weekly_board()
+        if week != self._week:
+            self._week = week
+            self._drop_old_weeks()
+        weekly = self.board(week)
+        unsaved = self._unsaved.setdefault(week, {})
+        for topic, delta in topic_xp.items():
+            self.board(topic_board(topic)).zincrby(delta, user_id)
+            weekly.zincrby(delta, user_id)
+            unsaved[user_id] = unsaved.get(user_id, 0) + delta
+
+    @staticmethod
+    def _kept_weeks():
+        # Keep last week around for "last week's winners"
+        return {weekly_board(), weekly_board(datetime.now(timezone.utc) - timedelta(weeks=1))}
+
+    def _drop_old_weeks(self):
+        keep = self._kept_weeks()
+        for name in [n for n in self.boards if n.startswith("weekly:") and n not in keep]:
+            del self.boards[name]
+
+    def _merge_unsaved(self, unsaved):
+        for name, deltas in unsaved.items():
+            target = self._unsaved.setdefault(name, {})
+            for user_id, delta in deltas.items():
+                target[user_id] = target.get(user_id, 0) + delta
+
+    def top(self, name, limit):
+        board = self.boards.get(name)
+        return board.zrevrange(0, limit - 1, withscores=True) if board else []
+
+    def size(self, name):
+        board = self.boards.get(name)
+        return board.zcard() if board else 0
+
+    def rank(self, name, user_id):
+        """1-based rank, score and board size, or None if the user isn't on the board."""
+        board = self.boards.get(name)
+        rank = board.zrevrank(user_id) if board else None
+        if rank is None:
+            return None
+        return {"rank": rank + 1, "score": board.zscore(user_id), "total": board.zcard()}
+
+    async def _load_totals(self, db):
+        """Global and per-topic boards from user_progress and chapter rows; exact whichever worker wrote them."""
+        boards = {GLOBAL_BOARD: self.board_factory()}
+        result = await db.execute(select(UserProgress.user_id, UserProgress.xp).where(UserProgress.xp > 0))
+        boards[GLOBAL_BOARD].zadd(dict(result.all()))
+
+        # Grouped on the raw columns; a user's paths for the same topic are summed here
+        result = await db.execute(
+            select(CatalogDocument.topic, LearningPath.path_name, UserChapterProgress.user_id, func.count())
+            .select_from(UserChapterProgress)
+            .join(LearningPath, LearningPath.id == UserChapterProgress.learning_path_id)
+            .outerjoin(CatalogDocument, CatalogDocument.content_hash == LearningPath.catalog_hash)
+            .group_by(CatalogDocument.topic, LearningPath.path_name, UserChapterProgress.user_id)
+        )
+        topic_xp = {}
+        for document_topic, name, user_id, chapters in result:
+            key = (topic_board(path_topic(document_topic, name)), user_id)
+            topic_xp[key] = topic_xp.get(key, 0) + chapters * self.xp_per_chapter
+        for (name, user_id), xp in topic_xp.items():
+            if name not in boards:
+                boards[name] = self.board_factory()
+            boards[name].zadd({user_id: xp})
+        return boards
+
+    async def warm(self, db, xp_per_chapter):
+        """Rebuild from the DB on startup: totals and per-topic XP are exact, weekly comes from snapshots."""
+        self.xp_per_chapter = xp_per_chapter
+        self._unsaved = {}
+        self.boards = await self._load_totals(db)
+
+        result = await db.execute(
+            select(LeaderboardSnapshot.board, LeaderboardSnapshot.user_id, LeaderboardSnapshot.score)
+            .where(LeaderboardSnapshot.board.like("weekly:%"))
+        )
+        for name, user_id, score in result:
+            self.board(name).zadd({user_id: score})
+        self._drop_old_weeks()
+
+    async def snapshot(self, db, refresh=True):
+        """Add this worker's unsaved weekly XP to the snapshot rows, then (with `refresh`) reload every board.
+
+        Every worker only adds its own deltas, so concurrent snapshots never overwrite each other.
+        A completion that commits while the reload is reading is picked up by the next snapshot.
+        """
+        unsaved, self._unsaved = self._unsaved, {}
+        kept = self._kept_weeks()
+        rows = [
+            {"board": name, "user_id": user_id, "score": delta}
+            for name, deltas in unsaved.items() if name in kept
+            for user_id, delta in deltas.items()
+        ]
+        try:
+            if rows:
+                stmt = dialect_insert(LeaderboardSnapshot).values(rows)
+                await db.execute(stmt.on_conflict_do_update(
+                    index_elements=[LeaderboardSnapshot.board, LeaderboardSnapshot.user_id],
+                    set_={"score": LeaderboardSnapshot.score + stmt.excluded.score, "taken_at": func.now()}
+                ))
+            await db.execute(
+                delete(LeaderboardSnapshot)
+                .where(LeaderboardSnapshot.board.like("weekly:%"), LeaderboardSnapshot.board.not_in(kept))
+            )
+            await db.commit()
+        except BaseException:
+            self._merge_unsaved(unsaved)  # retried by the next snapshot
+            raise
+        if not refresh:
+            return
+
+        # Pick up the other workers' XP
+        result = await db.execute(
+            select(LeaderboardSnapshot.board, LeaderboardSnapshot.user_id, LeaderboardSnapshot.score)
+            .where(LeaderboardSnapshot.board.in_(kept))
+        )
+        weekly_rows = result.all()
+        boards = await self._load_totals(db)
+        weekly = {}
+        for name, user_id, score in weekly_rows:
+            if name not in weekly:
+                weekly[name] = self.board_factory()
+            weekly[name].zadd({user_id: score})
+        for name, deltas in self._unsaved.items():  # recorded while this snapshot was running
+            if name not in weekly:
+                weekly[name] = self.board_factory()
+            for user_id, delta in deltas.items():
+                weekly[name].zincrby(delta, user_id)
+        boards.update(weekly)
+        self.boards = boards
+
+
+leaderboards = Leaderboards()
+
+
+async def snapshot_forever():
+    while True:
+        await asyncio.sleep(LEADERBOARD_SNAPSHOT_SECONDS)
+        try:
+            async with unit_of_work() as db:
+                await leaderboards.snapshot(db)
+        except Exception:
+            logger.exception("Leaderboard snapshot failed")
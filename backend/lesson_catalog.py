@@ -0,0 +1,105 @@
+import hashlib
+import os
+import time
+
+from sqlalchemy import select, update
+
+import config  # noqa: F401  (loads .env before any setting below is read)
+from cache import LRUCache
+from catalog import dump_json
+from database import dialect_insert
+from models import Content, ContentVersion
+
+# Other workers' version bumps are picked up after this many seconds
+CONTENT_VERSION_CHECK_SECONDS = float(os.getenv("CONTENT_VERSION_CHECK_SECONDS", "5"))
+LESSON_PAGE_CACHE_ENTRIES = int(os.getenv("LESSON_PAGE_CACHE_ENTRIES", "2000"))
+
+LESSON_FIELDS = ("id", "topic", "level", "title", "summary", "body", "content_type", "updated_at")
+DEFAULT_LIST_FIELDS = ("id", "topic", "level", "title", "summary", "content_type")  # no body in listings
+
+
+def parse_fields(fields):
+    """Comma-separated names -> ordered tuple of known columns; `id` is always included (it is the cursor)."""
+    if not fields:
+        return DEFAULT_LIST_FIELDS
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - set(LESSON_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(f for f in LESSON_FIELDS if f in requested or f == "id")
+
+
+class LessonCatalog:
+    """Serialized lesson pages cached in-process, dropped wholesale when content_version changes."""
+
+    def __init__(self, check_seconds=CONTENT_VERSION_CHECK_SECONDS, max_pages=LESSON_PAGE_CACHE_ENTRIES):
+        self.check_seconds = check_seconds
+        self.max_pages = max_pages
+        self.version = None
+        self._checked_at = None
+        self._pages = LRUCache(max_pages)
+
+    def invalidate(self):
+        """Re-read the version on the next request (this worker's own bumps apply immediately)."""
+        self._checked_at = None
+
+    async def _ensure(self, db):
+        if self._checked_at is not None and time.monotonic() - self._checked_at < self.check_seconds:
+            return
+        result = await db.execute(select(ContentVersion.version).where(ContentVersion.id == 1))
+        version = result.scalar() or 0
+        if version != self.version:
+            self.version = version
+            self._pages = LRUCache(self.max_pages)
+        self._checked_at = time.monotonic()
+
+    async def page(self, db, topic, level, fields, after, limit):
+        """(body, etag, next_cursor) for one keyset page ordered by id."""
+        await self._ensure(db)
+        key = (topic, level, fields, after, limit)
+        entry = await self._pages.get(key)
+        if entry is None:
+            entry = await self._build(db, topic, level, fields, after, limit)
+            await self._pages.set(key, entry)
+        return entry
+
+    async def lesson(self, db, lesson_id):
+        """(body, etag) for one lesson with every field, or None."""
+        await self._ensure(db)
+        key = ("lesson", lesson_id)
+        entry = await self._pages.get(key)
+        if entry is None:
+            result = await db.execute(select(*(getattr(Content, f) for f in LESSON_FIELDS)).where(Content.id == lesson_id))
+            row = result.first()
+            if row is None:
+                return None
+            entry = self._entry(dump_json(dict(row._mapping)))
+            await self._pages.set(key, entry)
+        return entry
+
+    async def _build(self, db, topic, level, fields, after, limit):
+        query = select(*(getattr(Content, f) for f in fields))
+        if topic is not None:
+            query = query.where(Content.topic == topic)
+        if level is not None:
+            query = query.where(Content.level == level)
+        if after is not None:
+            query = query.where(Content.id > after)
+        rows = (await db.execute(query.order_by(Content.id).limit(limit))).all()
+        next_cursor = str(rows[-1].id) if len(rows) == limit else None
+        return self._entry(dump_json([dict(row._mapping) for row in rows])) + (next_cursor,)
+
+    def _entry(self, body):
+        digest = hashlib.blake2b(body, digest_size=12).hexdigest()
+        return body, f'"{self.version}-{digest}"'
+
+    async def bump(self, db):
+        """Bump content_version inside the caller's transaction; commit, then call invalidate()."""
+        result = await db.execute(
+            update(ContentVersion).where(ContentVersion.id == 1).values(version=ContentVersion.version + 1)
+        )
+        if not result.rowcount:
+            await db.execute(dialect_insert(ContentVersion).values(id=1, version=1).on_conflict_do_nothing())
+
+
+lesson_catalog = LessonCatalog()
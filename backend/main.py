@@ -1,9 +1,43 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
+import config  # noqa: F401  (first: loads .env before any module reads settings)
+from catalog import CATALOG_RELOAD_SECONDS, watch_catalog_forever
+from credentials import hashing_pool
+from database import async_engine, engine
+from leaderboard import leaderboards, snapshot_forever
+from metrics import RequestMetricsMiddleware, instrument_engine, render_metrics
+from sessions import dispose_engines, replica_engine, unit_of_work
+from tokens import refresh_revocations_forever
 from routers import learning_path, progress
 from routers import auth
+from routers import admin
+from routers import leaderboard
+from routers import rewards
+from routers import lessons
+from routers.progress import XP_PER_CHAPTER
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with unit_of_work(read_only=True) as db:
+        await leaderboards.warm(db, XP_PER_CHAPTER)
+    background = [
+        asyncio.create_task(refresh_revocations_forever()),
+        asyncio.create_task(snapshot_forever()),
+    ]
+    if CATALOG_RELOAD_SECONDS:
+        background.append(asyncio.create_task(watch_catalog_forever()))
+    yield
+    for task in background:
+        task.cancel()
+    async with unit_of_work() as db:
+        await leaderboards.snapshot(db, refresh=False)
+    hashing_pool.shutdown()
+    await dispose_engines()
+
+app = FastAPI(lifespan=lifespan)
 
 # CORS setup
 app.add_middleware(
@@ -12,12 +46,28 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-Next-Cursor", "ETag"],
 )
 
+# 📊 Query counts and timings per route: Server-Timing header + /metrics
+app.add_middleware(RequestMetricsMiddleware)
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+if replica_engine is not None:
+    instrument_engine(replica_engine.sync_engine)
+
 # Mount routers
 app.include_router(learning_path.router)
 app.include_router(progress.router)
 app.include_router(auth.router)
+app.include_router(admin.router)
+app.include_router(leaderboard.router)
+app.include_router(rewards.router)
+app.include_router(lessons.router)
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
 
 @app.get("/")
 def read_root():
@@ -0,0 +1,149 @@
+"""Operational commands. Run from this directory, e.g.:
+
+    python manage.py import-users cohort.csv
+    python manage.py export-progress all --gzip -o progress.ndjson.gz
+    python manage.py reset-streaks            # nightly, shortly after midnight in STREAK_TIMEZONE
+    python manage.py rebuild-summaries        # repair path_progress_summary from raw chapter rows
+"""
+import argparse
+import csv
+import io
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from sqlalchemy import delete, func, insert, select, text
+
+from credentials import HASH_WORKERS, hash_password, is_legacy
+from database import dialect_insert, engine
+from exports import EXPORT_FORMATS, EXPORT_TABLES, export_stream
+from models import PathProgressSummary, User, UserChapterProgress
+from streaks import reset_broken_streaks_statement
+
+IMPORT_CHUNK = 5000
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _hashed_rows(rows, executor):
+    """CSV rows -> insert dicts. A ready-made `password_hash` column skips hashing."""
+    plain = [row for row in rows if not row.get("password_hash")]
+    hashes = dict(zip(map(id, plain), executor.map(hash_password, (row["password"] for row in plain))))
+    for row in rows:
+        password = row.get("password_hash") or hashes[id(row)]
+        if row.get("password_hash") and is_legacy(password):
+            raise ValueError(f"password_hash for {row['email']} is not a recognised hash")
+        yield {"email": row["email"], "username": row["username"], "password": password}
+
+
+def _copy_users(conn, rows):
+    """Postgres: COPY into a temp table, then one INSERT ... SELECT that skips existing users."""
+    raw = conn.connection.driver_connection
+    with raw.cursor() as cursor:
+        cursor.execute("CREATE TEMP TABLE IF NOT EXISTS users_import (email text, username text, password text) ON COMMIT DELETE ROWS")
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows((r["email"], r["username"], r["password"]) for r in rows)
+        buffer.seek(0)
+        cursor.copy_expert("COPY users_import (email, username, password) FROM STDIN WITH (FORMAT csv)", buffer)
+    result = conn.execute(text(
+        "INSERT INTO users (email, username, password) "
+        "SELECT email, username, password FROM users_import "
+        "ON CONFLICT DO NOTHING"
+    ))
+    return result.rowcount
+
+
+def import_users(args):
+    with open(args.csv_file, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        columns = set(reader.fieldnames or [])
+        missing = {"email", "username"} - columns
+        if missing or not columns & {"password", "password_hash"}:
+            sys.exit("CSV needs email, username and password (or password_hash) columns")
+
+        use_copy = engine.dialect.name == "postgresql" and engine.dialect.driver == "psycopg2"
+        inserted = seen = 0
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            for chunk in _chunks(reader, IMPORT_CHUNK):
+                rows = list(_hashed_rows(chunk, executor))
+                seen += len(rows)
+                with engine.begin() as conn:
+                    if use_copy:
+                        inserted += _copy_users(conn, rows)
+                    else:
+                        # executemany; duplicates of existing users are skipped
+                        result = conn.execute(dialect_insert(User).on_conflict_do_nothing(), rows)
+                        inserted += max(result.rowcount, 0)
+                print(f"{seen:,} rows read, {inserted:,} users created", flush=True)
+
+
+def export_progress(args):
+    try:
+        chunks = export_stream(args.table, args.format, args.gzip)
+    except ValueError as e:
+        sys.exit(str(e))
+    out = open(args.output, "wb") if args.output != "-" else sys.stdout.buffer
+    try:
+        for chunk in chunks:
+            out.write(chunk)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+
+
+def reset_streaks(args):
+    with engine.begin() as conn:
+        result = conn.execute(reset_broken_streaks_statement())
+    print(f"{result.rowcount:,} broken streaks reset")
+
+
+def rebuild_summaries(args):
+    group = [
+        UserChapterProgress.user_id,
+        UserChapterProgress.learning_path_id,
+        UserChapterProgress.step_number,
+        UserChapterProgress.experience_level,
+    ]
+    with engine.begin() as conn:
+        conn.execute(delete(PathProgressSummary))
+        result = conn.execute(
+            insert(PathProgressSummary).from_select(
+                ["user_id", "learning_path_id", "step_number", "experience_level", "completed_chapters"],
+                select(*group, func.count()).group_by(*group),
+            )
+        )
+    print(f"{result.rowcount:,} summary rows rebuilt")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    users = commands.add_parser("import-users", help="bulk-create users from a CSV (email,username,password or password_hash)")
+    users.add_argument("csv_file")
+    users.add_argument("--workers", type=int, default=HASH_WORKERS, help="threads used for password hashing")
+    users.set_defaults(handler=import_users)
+
+    export = commands.add_parser("export-progress", help="stream progress tables as NDJSON or CSV")
+    export.add_argument("table", choices=[*EXPORT_TABLES, "all"])
+    export.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson")
+    export.add_argument("--gzip", action="store_true")
+    export.add_argument("-o", "--output", default="-", help="file to write (default: stdout)")
+    export.set_defaults(handler=export_progress)
+
+    streaks = commands.add_parser("reset-streaks", help="zero streaks with no lesson since yesterday (one UPDATE)")
+    streaks.set_defaults(handler=reset_streaks)
+
+    summaries = commands.add_parser("rebuild-summaries", help="recompute path_progress_summary with one GROUP BY")
+    summaries.set_defaults(handler=rebuild_summaries)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
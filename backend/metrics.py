@@ -0,0 +1,226 @@
+import bisect
+import contextvars
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import event
+
+import config  # noqa: F401  (loads .env before any setting below is read)
+
+logger = logging.getLogger(__name__)
+
+# ⚙️ Instrumentation settings
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "1000"))
+QUERY_COUNT_WARN = int(os.getenv("QUERY_COUNT_WARN", "20"))  # more statements than this in one request smells like N+1
+SERVER_TIMING = os.getenv("SERVER_TIMING", "true").lower() in ("1", "true", "yes")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55)
+
+
+class RequestMetrics:
+    __slots__ = ("scope", "queries", "db_seconds", "serialize_seconds")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+
+
+# The request being served in this task (None for startup work and background tasks)
+_current = contextvars.ContextVar("request_metrics", default=None)
+
+
+class Histogram:
+    """Prometheus-style cumulative histogram keyed by a label tuple."""
+
+    def __init__(self, name, help, labels, buckets):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_values, value):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][bisect.bisect_left(self.buckets, value)] += 1
+            series[1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = [(labels, list(counts), total) for labels, (counts, total) in self._series.items()]
+        for label_values, counts, total in sorted(snapshot):
+            labels = _labels(self.labels, label_values)
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{self.name}_bucket{{{labels},le="+Inf"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{labels}}} {total}")
+            lines.append(f"{self.name}_count{{{labels}}} {cumulative}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help, labels):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def inc(self, label_values, amount=1):
+        with self._lock:
+            self._values[label_values] += amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            snapshot = sorted(self._values.items())
+        for label_values, value in snapshot:
+            lines.append(f"{self.name}{{{_labels(self.labels, label_values)}}} {value}")
+        return lines
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values):
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+ROUTE_LABELS = ("method", "route")
+request_seconds = Histogram("http_request_duration_seconds", "Time to the last response byte.", ROUTE_LABELS, LATENCY_BUCKETS)
+request_db_seconds = Histogram("http_request_db_seconds", "Time spent in SQL statements per request.", ROUTE_LABELS, LATENCY_BUCKETS)
+request_serialize_seconds = Histogram("http_request_serialization_seconds", "Time spent encoding JSON per request.", ROUTE_LABELS, LATENCY_BUCKETS)
+request_queries = Histogram("http_request_db_queries", "SQL statements issued per request.", ROUTE_LABELS, QUERY_COUNT_BUCKETS)
+requests_total = Counter("http_requests_total", "Requests served.", ROUTE_LABELS + ("status",))
+slow_queries_total = Counter("db_slow_queries_total", f"Statements slower than SLOW_QUERY_MS ({SLOW_QUERY_MS:g} ms).", ("route",))
+
+REGISTRY = (request_seconds, request_db_seconds, request_serialize_seconds, request_queries, requests_total, slow_queries_total)
+
+
+def render_metrics():
+    """Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# 🔍 SQLAlchemy hooks
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    current = _current.get()
+    if current is not None:
+        current.queries += 1
+        current.db_seconds += elapsed
+    if elapsed * 1000 >= SLOW_QUERY_MS:
+        route = _route_label(current.scope) if current is not None else "background"
+        slow_queries_total.inc((route,))
+        logger.warning("Slow query (%.1f ms) in %s: %s", elapsed * 1000, route, " ".join(statement.split())[:500])
+
+
+def _handle_error(context):
+    # after_cursor_execute never fires for a statement that raised; drop its start time
+    conn = context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+
+
+def instrument_engine(engine):
+    """Count and time every statement on `engine` (pass async_engine.sync_engine for the async one)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class serializing:
+    """`with serializing(): body = ...` adds the block's time to the current request's serialization time."""
+    __slots__ = ("start",)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        current = _current.get()
+        if current is not None:
+            current.serialize_seconds += time.perf_counter() - self.start
+
+
+class TimedORJSONResponse(ORJSONResponse):
+    def render(self, content):
+        with serializing():
+            return super().render(content)
+
+
+# 📊 Middleware
+def _route_label(scope):
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"  # never the raw path, it would explode label cardinality
+
+
+class RequestMetricsMiddleware:
+    """Pure ASGI middleware: per-route query count, DB / serialization / total time,
+    exposed as a Server-Timing header and as the histograms behind /metrics."""
+
+    def __init__(self, app, skip_paths=("/metrics",)):
+        self.app = app
+        self.skip_paths = skip_paths
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            return await self.app(scope, receive, send)
+
+        metrics = RequestMetrics(scope)
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if SERVER_TIMING:
+                    total_ms = (time.perf_counter() - start) * 1000
+                    header = (
+                        f"db;dur={metrics.db_seconds * 1000:.2f};desc=\"{metrics.queries} queries\", "
+                        f"serialize;dur={metrics.serialize_seconds * 1000:.2f}, "
+                        f"total;dur={total_ms:.2f}"
+                    )
+                    message["headers"] = list(message.get("headers", [])) + [(b"server-timing", header.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            elapsed = time.perf_counter() - start
+            _current.reset(token)
+            labels = (scope["method"], _route_label(scope))
+            request_seconds.observe(labels, elapsed)
+            request_db_seconds.observe(labels, metrics.db_seconds)
+            request_serialize_seconds.observe(labels, metrics.serialize_seconds)
+            request_queries.observe(labels, metrics.queries)
+            requests_total.inc(labels + (status,))
+            if elapsed * 1000 >= SLOW_REQUEST_MS or metrics.queries > QUERY_COUNT_WARN:
+                logger.warning(
+                    "Slow request %s %s: %.1f ms total, %d queries in %.1f ms, %.1f ms serializing",
+                    *labels, elapsed * 1000, metrics.queries, metrics.db_seconds * 1000, metrics.serialize_seconds * 1000,
+                )
@@ -0,0 +1,75 @@
+"""initial schema, as it existed before migrations
+
+Revision ID: 0001_initial
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0001_initial"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+JSONDocument = sa.JSON().with_variant(postgresql.JSONB(), "postgresql")
+
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String(), nullable=False, unique=True),
+        sa.Column("username", sa.String(), nullable=False, unique=True),
+        sa.Column("password", sa.Text(), nullable=False),
+        sa.Column("profile_pic", sa.Text()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+
+    op.create_table(
+        "user_progress",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE")),
+        sa.Column("xp", sa.Integer()),
+        sa.Column("lessons_completed", sa.Integer()),
+        sa.Column("streak_count", sa.Integer()),
+        sa.Column("last_lesson_date", sa.DateTime()),
+    )
+    op.create_index("ix_user_progress_id", "user_progress", ["id"])
+
+    op.create_table(
+        "learning_paths",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE")),
+        sa.Column("path_name", sa.String(255)),
+        sa.Column("path_json", JSONDocument),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_learning_paths_id", "learning_paths", ["id"])
+
+    op.create_table(
+        "user_chapter_progress",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("learning_path_id", sa.Integer(), nullable=False),
+        sa.Column("step_number", sa.Integer(), nullable=False),
+        sa.Column("chapter_number", sa.Integer(), nullable=False),
+        sa.Column("experience_level", sa.String(), nullable=False),
+    )
+    op.create_index("ix_user_chapter_progress_id", "user_chapter_progress", ["id"])
+
+    op.create_table(
+        "user_badges",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE")),
+        sa.Column("badge_name", sa.String()),
+        sa.Column("earned_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_user_badges_id", "user_badges", ["id"])
+
+
+def downgrade():
+    for table in ("user_badges", "user_chapter_progress", "learning_paths", "user_progress", "users"):
+        op.drop_table(table)
@@ -0,0 +1,38 @@
+"""content-addressed catalog documents referenced by learning_paths
+
+Revision ID: 0002_catalog_documents
+Revises: 0001_initial
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0002_catalog_documents"
+down_revision = "0001_initial"
+branch_labels = None
+depends_on = None
+
+JSONDocument = sa.JSON().with_variant(postgresql.JSONB(), "postgresql")
+
+
+def upgrade():
+    op.create_table(
+        "catalog_documents",
+        sa.Column("content_hash", sa.String(64), primary_key=True),
+        sa.Column("topic", sa.String(255), nullable=False),
+        sa.Column("document", JSONDocument, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    with op.batch_alter_table("learning_paths") as batch:
+        batch.add_column(sa.Column("catalog_hash", sa.String(64)))
+        batch.create_foreign_key(
+            "fk_learning_paths_catalog_hash", "catalog_documents", ["catalog_hash"], ["content_hash"]
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("learning_paths") as batch:
+        batch.drop_constraint("fk_learning_paths_catalog_hash", type_="foreignkey")
+        batch.drop_column("catalog_hash")
+    op.drop_table("catalog_documents")
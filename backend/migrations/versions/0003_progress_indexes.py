@@ -0,0 +1,53 @@
+"""unique keys and lookup indexes for the progress tables
+
+Revision ID: 0003_progress_indexes
+Revises: 0002_catalog_documents
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0003_progress_indexes"
+down_revision = "0002_catalog_documents"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Duplicates from the old check-then-insert code would block the unique indexes
+    op.execute("""
+        DELETE FROM user_chapter_progress WHERE id NOT IN (
+            SELECT MIN(id) FROM user_chapter_progress
+            GROUP BY user_id, learning_path_id, step_number, chapter_number, experience_level
+        )
+    """)
+    op.execute("""
+        DELETE FROM user_badges WHERE id NOT IN (
+            SELECT MIN(id) FROM user_badges GROUP BY user_id, badge_name
+        )
+    """)
+    # Keep the row with the most XP for each user
+    op.execute("""
+        DELETE FROM user_progress WHERE id NOT IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY xp DESC, id) AS rn
+                FROM user_progress
+            ) ranked WHERE rn = 1
+        )
+    """)
+
+    op.create_index(
+        "uq_user_chapter_progress",
+        "user_chapter_progress",
+        ["user_id", "learning_path_id", "step_number", "chapter_number", "experience_level"],
+        unique=True,
+    )
+    op.create_index("uq_user_progress_user_id", "user_progress", ["user_id"], unique=True)
+    op.create_index("uq_user_badges_user_badge", "user_badges", ["user_id", "badge_name"], unique=True)
+    op.create_index("ix_learning_paths_user_created", "learning_paths", ["user_id", "created_at", "id"])
+
+
+def downgrade():
+    op.drop_index("ix_learning_paths_user_created", table_name="learning_paths")
+    op.drop_index("uq_user_badges_user_badge", table_name="user_badges")
+    op.drop_index("uq_user_progress_user_id", table_name="user_progress")
+    op.drop_index("uq_user_chapter_progress", table_name="user_chapter_progress")
@@ -0,0 +1,39 @@
+"""earned-badge bitmask on user_progress
+
+Revision ID: 0004_badge_mask
+Revises: 0003_progress_indexes
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004_badge_mask"
+down_revision = "0003_progress_indexes"
+branch_labels = None
+depends_on = None
+
+# Snapshot of badges.BADGE_RULES bits at the time of this migration
+BADGE_BITS = {
+    "Beginner Badge 🥉": 0,
+    "Intermediate Badge 🥈": 1,
+    "Advanced Badge 🥇": 2,
+    "Expert Badge 🏆": 3,
+}
+
+
+def upgrade():
+    with op.batch_alter_table("user_progress") as batch:
+        batch.add_column(sa.Column("badge_mask", sa.BigInteger(), nullable=False, server_default="0"))
+
+    for name, bit in BADGE_BITS.items():
+        op.execute(
+            sa.text(
+                "UPDATE user_progress SET badge_mask = badge_mask | :bit "
+                "WHERE user_id IN (SELECT user_id FROM user_badges WHERE badge_name = :name)"
+            ).bindparams(bit=1 << bit, name=name)
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("user_progress") as batch:
+        batch.drop_column("badge_mask")
@@ -0,0 +1,25 @@
+"""revoked session tokens
+
+Revision ID: 0005_revoked_tokens
+Revises: 0004_badge_mask
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005_revoked_tokens"
+down_revision = "0004_badge_mask"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "revoked_tokens",
+        sa.Column("jti", sa.String(32), primary_key=True),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("revoked_tokens")
@@ -0,0 +1,27 @@
+"""leaderboard snapshots
+
+Revision ID: 0006_leaderboard_snapshots
+Revises: 0005_revoked_tokens
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006_leaderboard_snapshots"
+down_revision = "0005_revoked_tokens"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "leaderboard_snapshots",
+        sa.Column("board", sa.String(64), primary_key=True),
+        sa.Column("user_id", sa.Integer(), primary_key=True),
+        sa.Column("score", sa.Integer(), nullable=False),
+        sa.Column("taken_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+
+def downgrade():
+    op.drop_table("leaderboard_snapshots")
@@ -0,0 +1,35 @@
+"""per-path completion summary table
+
+Revision ID: 0007_path_progress_summary
+Revises: 0006_leaderboard_snapshots
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007_path_progress_summary"
+down_revision = "0006_leaderboard_snapshots"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "path_progress_summary",
+        sa.Column("user_id", sa.Integer(), primary_key=True),
+        sa.Column("learning_path_id", sa.Integer(), primary_key=True),
+        sa.Column("step_number", sa.Integer(), primary_key=True),
+        sa.Column("experience_level", sa.String(), primary_key=True),
+        sa.Column("completed_chapters", sa.Integer(), nullable=False, server_default="0"),
+    )
+    # Backfill from history once; complete_chapter keeps it current from here on
+    op.execute("""
+        INSERT INTO path_progress_summary (user_id, learning_path_id, step_number, experience_level, completed_chapters)
+        SELECT user_id, learning_path_id, step_number, experience_level, COUNT(*)
+        FROM user_chapter_progress
+        GROUP BY user_id, learning_path_id, step_number, experience_level
+    """)
+
+
+def downgrade():
+    op.drop_table("path_progress_summary")
@@ -0,0 +1,54 @@
+"""reward catalog, claimed rewards and the per-user gift counter
+
+Revision ID: 0008_rewards
+Revises: 0007_path_progress_summary
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008_rewards"
+down_revision = "0007_path_progress_summary"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "gifts",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("gift_name", sa.String(), nullable=False),
+        sa.Column("gift_type", sa.String(), nullable=False),
+        sa.Column("weight", sa.Integer(), nullable=False, server_default="1"),
+    )
+    op.create_index("ix_gifts_id", "gifts", ["id"])
+
+    op.create_table(
+        "big_motivators",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("motivator_name", sa.String(), nullable=False),
+        sa.Column("weight", sa.Integer(), nullable=False, server_default="1"),
+    )
+    op.create_index("ix_big_motivators_id", "big_motivators", ["id"])
+
+    op.create_table(
+        "user_rewards",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("reward_type", sa.String(), nullable=False),
+        sa.Column("reward_name", sa.String(), nullable=False),
+        sa.Column("claimed_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_user_rewards_id", "user_rewards", ["id"])
+    op.create_index("ix_user_rewards_user_id", "user_rewards", ["user_id"])
+
+    with op.batch_alter_table("user_progress") as batch:
+        batch.add_column(sa.Column("gifts_claimed", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade():
+    with op.batch_alter_table("user_progress") as batch:
+        batch.drop_column("gifts_claimed")
+    op.drop_table("user_rewards")
+    op.drop_table("big_motivators")
+    op.drop_table("gifts")
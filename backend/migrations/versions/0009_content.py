@@ -0,0 +1,42 @@
+"""lesson content and the content version counter
+
+Revision ID: 0009_content
+Revises: 0008_rewards
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0009_content"
+down_revision = "0008_rewards"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "content",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("topic", sa.String(), nullable=False),
+        sa.Column("level", sa.String(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("summary", sa.Text()),
+        sa.Column("body", sa.Text()),
+        sa.Column("content_type", sa.String(), nullable=False, server_default="lesson"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_content_id", "content", ["id"])
+    op.create_index("ix_content_topic_level_id", "content", ["topic", "level", "id"])
+
+    version = op.create_table(
+        "content_version",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.bulk_insert(version, [{"id": 1, "version": 1}])
+
+
+def downgrade():
+    op.drop_table("content_version")
+    op.drop_table("content")
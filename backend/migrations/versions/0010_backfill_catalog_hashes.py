@@ -0,0 +1,118 @@
+"""move legacy learning_paths.path_json blobs into catalog_documents
+
+Revision ID: 0010_backfill_catalog_hashes
+Revises: 0009_content
+Create Date: 2026-10-17
+"""
+import hashlib
+
+import orjson
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql, sqlite
+
+revision = "0010_backfill_catalog_hashes"
+down_revision = "0009_content"
+branch_labels = None
+depends_on = None
+
+JSONDocument = sa.JSON().with_variant(postgresql.JSONB(), "postgresql")
+BATCH_SIZE = 500
+PATH_NAME_PREFIX = "Custom Path for "
+
+learning_paths = sa.table(
+    "learning_paths",
+    sa.column("id", sa.Integer()),
+    sa.column("path_name", sa.String()),
+    sa.column("path_json", JSONDocument),
+    sa.column("catalog_hash", sa.String()),
+)
+catalog_documents = sa.table(
+    "catalog_documents",
+    sa.column("content_hash", sa.String()),
+    sa.column("topic", sa.String()),
+    sa.column("document", JSONDocument),
+)
+
+
+# Snapshot of catalog.normalize_step at the time of this migration, for paths whose topic the
+# catalog no longer has. Legacy rows were stored with a flat "quiz" list and no per-question
+# "chapter" (and JSONB reorders keys), so these never hash to a catalog topic's content_hash.
+def public_step(step):
+    public = {k: v for k, v in step.items() if k not in ("quizzes", "quiz")}
+    if "quizzes" in step:
+        public["quiz"] = [
+            dict({k: v for k, v in q.items() if k != "correctAnswer"}, chapter=quiz_set["chapter"])
+            for quiz_set in step["quizzes"] for q in quiz_set["questions"]
+        ]
+    elif "quiz" in step:
+        public["quiz"] = [{k: v for k, v in q.items() if k != "correctAnswer"} for q in step["quiz"]]
+    return public
+
+
+def topic_name(path_name):
+    if path_name and path_name.startswith(PATH_NAME_PREFIX):
+        return path_name[len(PATH_NAME_PREFIX):]
+    return path_name or "unknown"
+
+
+def upgrade():
+    from catalog import catalog_store
+
+    # A legacy path of a topic the catalog still has becomes a reference to that topic's current
+    # version: its blob would only ever be an equivalent, older copy without per-question chapters
+    catalog = catalog_store.current
+    bind = op.get_bind()
+    insert = sqlite.insert if bind.dialect.name == "sqlite" else postgresql.insert
+    set_hash = (
+        learning_paths.update()
+        .where(learning_paths.c.id == sa.bindparam("row_id"))
+        .values(catalog_hash=sa.bindparam("content_hash"), path_json=sa.null())
+    )
+
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(learning_paths.c.id, learning_paths.c.path_name, learning_paths.c.path_json)
+            .where(
+                learning_paths.c.id > last_id,
+                learning_paths.c.catalog_hash.is_(None),
+                learning_paths.c.path_json.is_not(None),
+            )
+            .order_by(learning_paths.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        documents = {}
+        updates = []
+        for row in rows:
+            if not isinstance(row.path_json, list):
+                continue  # JSON null or a shape nothing can render; left as it is
+            topic = catalog.get(topic_name(row.path_name))
+            if topic is not None:
+                content_hash, document = topic.content_hash, topic.path
+            else:
+                document = [public_step(step) if isinstance(step, dict) else step for step in row.path_json]
+                content_hash = hashlib.sha256(orjson.dumps(document)).hexdigest()
+            documents.setdefault(content_hash, {
+                "content_hash": content_hash,
+                "topic": topic.name if topic is not None else topic_name(row.path_name),
+                "document": document,
+            })
+            updates.append({"row_id": row.id, "content_hash": content_hash})
+
+        if documents:
+            bind.execute(
+                insert(catalog_documents).values(list(documents.values()))
+                .on_conflict_do_nothing(index_elements=["content_hash"])
+            )
+            bind.execute(set_hash, updates)
+
+
+def downgrade():
+    # Rows that reference catalog_documents are valid at every earlier revision
+    # (and the original blobs, answers included, are gone)
+    pass
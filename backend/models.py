@@ -1,9 +1,12 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, ForeignKey, JSON, Index
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from database import Base
 from sqlalchemy import Column, Integer, String
 
+# JSONB on Postgres, plain JSON elsewhere (SQLite for local runs/tests)
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
+
 class User(Base):
     __tablename__ = "users"
 
@@ -16,6 +19,7 @@ class User(Base):
 
 class UserProgress(Base):
     __tablename__ = "user_progress"
+    __table_args__ = (Index("uq_user_progress_user_id", "user_id", unique=True),)
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
@@ -23,18 +27,37 @@ class UserProgress(Base):
     lessons_completed = Column(Integer, default=0)
     streak_count = Column(Integer, default=0)
     last_lesson_date = Column(DateTime)
+    badge_mask = Column(BigInteger, nullable=False, default=0, server_default="0")  # bit per badges.BADGE_RULES entry
+    gifts_claimed = Column(Integer, nullable=False, default=0, server_default="0")  # counter, so big-motivator checks never COUNT(*)
+
+class CatalogDocument(Base):
+    __tablename__ = "catalog_documents"
+
+    # sha256 of the serialized topic, so identical content is stored once
+    content_hash = Column(String(64), primary_key=True)
+    topic = Column(String(255), nullable=False)
+    document = Column(JSONDocument, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 class LearningPath(Base):
     __tablename__ = "learning_paths"
+    # Matches /my_paths' newest-first keyset pagination
+    __table_args__ = (Index("ix_learning_paths_user_created", "user_id", "created_at", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
     path_name = Column(String(255))
-    path_json = Column(JSONB)
+    path_json = Column(JSONDocument)  # Legacy rows only; new rows reference catalog_documents
+    catalog_hash = Column(String(64), ForeignKey("catalog_documents.content_hash"))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+# One completion per chapter per experience level; target of complete_chapter's ON CONFLICT
+CHAPTER_PROGRESS_KEY = ["user_id", "learning_path_id", "step_number", "chapter_number", "experience_level"]
+
 class UserChapterProgress(Base):
     __tablename__ = "user_chapter_progress"
+    # Leading user_id also serves get_completed_chapters' per-user lookup
+    __table_args__ = (Index("uq_user_chapter_progress", *CHAPTER_PROGRESS_KEY, unique=True),)
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, nullable=False)
@@ -46,8 +69,88 @@ class UserChapterProgress(Base):
 
 class UserBadges(Base):
     __tablename__ = "user_badges"
+    __table_args__ = (Index("uq_user_badges_user_badge", "user_id", "badge_name", unique=True),)
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
     badge_name = Column(String)
     earned_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String(32), primary_key=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+
+class LeaderboardSnapshot(Base):
+    __tablename__ = "leaderboard_snapshots"
+
+    board = Column(String(64), primary_key=True)  # e.g. "weekly:2025-W07"
+    user_id = Column(Integer, primary_key=True)
+    score = Column(Integer, nullable=False)
+    taken_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class PathProgressSummary(Base):
+    """Completed-chapter counts per (user, path, step, level), maintained by complete_chapter."""
+    __tablename__ = "path_progress_summary"
+
+    user_id = Column(Integer, primary_key=True)
+    learning_path_id = Column(Integer, primary_key=True)
+    step_number = Column(Integer, primary_key=True)
+    experience_level = Column(String, primary_key=True)
+    completed_chapters = Column(Integer, nullable=False, default=0)
+
+
+class Gift(Base):
+    __tablename__ = "gifts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    gift_name = Column(String, nullable=False)
+    gift_type = Column(String, nullable=False)
+    weight = Column(Integer, nullable=False, default=1, server_default="1")  # relative pick probability; 0 disables
+
+
+class BigMotivator(Base):
+    __tablename__ = "big_motivators"
+
+    id = Column(Integer, primary_key=True, index=True)
+    motivator_name = Column(String, nullable=False)
+    weight = Column(Integer, nullable=False, default=1, server_default="1")
+
+
+class UserReward(Base):
+    __tablename__ = "user_rewards"
+    __table_args__ = (Index("ix_user_rewards_user_id", "user_id"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    reward_type = Column(String, nullable=False)
+    reward_name = Column(String, nullable=False)
+    claimed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class Content(Base):
+    """Lesson content; list pages are served from lesson_catalog, keyed by ContentVersion."""
+    __tablename__ = "content"
+    __table_args__ = (Index("ix_content_topic_level_id", "topic", "level", "id"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    topic = Column(String, nullable=False)
+    level = Column(String, nullable=False)  # beginner / intermediate / advanced
+    title = Column(String, nullable=False)
+    summary = Column(Text)
+    body = Column(Text)
+    content_type = Column(String, nullable=False, default="lesson", server_default="lesson")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class ContentVersion(Base):
+    """Single row (id=1); bumped whenever content changes so every worker drops its cached pages."""
+    __tablename__ = "content_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=1)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
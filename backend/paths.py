@@ -0,0 +1,31 @@
+from sqlalchemy import select
+
+from models import CatalogDocument, LearningPath
+
+# Every generated path is named after its topic; legacy rows have nothing else to go on
+PATH_NAME_PREFIX = "Custom Path for "
+
+
+def path_name(topic_name):
+    return PATH_NAME_PREFIX + topic_name
+
+
+def path_topic(document_topic, name):
+    """Topic of a path from its catalog document's topic (None for legacy rows) and its path_name."""
+    if document_topic is not None:
+        return document_topic
+    if name and name.startswith(PATH_NAME_PREFIX):
+        return name[len(PATH_NAME_PREFIX):]
+    return name
+
+
+async def path_topics(db, path_ids, user_id=None):
+    """{path_id: topic name} for the given paths (only `user_id`'s own when given). One query."""
+    query = (
+        select(LearningPath.id, CatalogDocument.topic, LearningPath.path_name)
+        .outerjoin(CatalogDocument, CatalogDocument.content_hash == LearningPath.catalog_hash)
+        .where(LearningPath.id.in_(list(path_ids)))
+    )
+    if user_id is not None:
+        query = query.where(LearningPath.user_id == user_id)
+    return {path_id: path_topic(topic, name) for path_id, topic, name in await db.execute(query)}
@@ -0,0 +1,80 @@
+import os
+import random
+import time
+
+from sqlalchemy import select
+
+import config  # noqa: F401  (loads .env before any setting below is read)
+from models import BigMotivator, Gift
+
+# Other workers' catalog edits are picked up after this many seconds
+REWARD_CATALOG_TTL_SECONDS = int(os.getenv("REWARD_CATALOG_TTL_SECONDS", "300"))
+
+
+class AliasTable:
+    """Vose's alias method: O(n) build, O(1) weighted pick."""
+
+    def __init__(self, items, weights):
+        n = len(items)
+        total = float(sum(weights))
+        if n == 0 or total <= 0:
+            raise ValueError("AliasTable needs at least one positive weight")
+        self.items = list(items)
+        self.prob = [0.0] * n
+        self.alias = [0] * n
+
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        for i in small + large:  # leftovers are 1.0 up to float error
+            self.prob[i] = 1.0
+
+    def pick(self, rng=random):
+        i = rng.randrange(len(self.items))
+        return self.items[i] if rng.random() < self.prob[i] else self.items[self.alias[i]]
+
+
+class RewardCatalog:
+    """Gifts and big motivators held in memory as alias tables; reloaded when invalidated or stale."""
+
+    def __init__(self, ttl=REWARD_CATALOG_TTL_SECONDS):
+        self.ttl = ttl
+        self.gifts = None
+        self.motivators = None
+        self._loaded_at = None
+
+    def invalidate(self):
+        self._loaded_at = None
+
+    async def _load(self, db):
+        gifts = (await db.execute(
+            select(Gift.gift_name, Gift.gift_type, Gift.weight).where(Gift.weight > 0)
+        )).all()
+        motivators = (await db.execute(
+            select(BigMotivator.motivator_name, BigMotivator.weight).where(BigMotivator.weight > 0)
+        )).all()
+        self.gifts = AliasTable([(g.gift_name, g.gift_type) for g in gifts], [g.weight for g in gifts]) if gifts else None
+        self.motivators = AliasTable([m.motivator_name for m in motivators], [m.weight for m in motivators]) if motivators else None
+        self._loaded_at = time.monotonic()
+
+    async def _ensure(self, db):
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl:
+            await self._load(db)
+
+    async def pick_gift(self, db):
+        """(gift_name, gift_type), or None if the catalog is empty."""
+        await self._ensure(db)
+        return self.gifts.pick() if self.gifts else None
+
+    async def pick_motivator(self, db):
+        await self._ensure(db)
+        return self.motivators.pick() if self.motivators else None
+
+
+reward_catalog = RewardCatalog()
@@ -0,0 +1,102 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from credentials import hashing_pool
+from database import async_engine, engine, pool_stats
+from exports import export_stream
+from lesson_catalog import lesson_catalog
+from models import BigMotivator, Content, Gift
+from reward_catalog import reward_catalog
+from schemas import CreatedOut, DBPoolStatsOut, HashingPoolStatsOut, MessageOut
+from sessions import get_db, replica_engine
+from tokens import require_admin
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin"],
+    dependencies=[Depends(require_admin)]  # 🔐 X-Admin-Token header
+)
+
+# 📊 Connection pool usage, for sizing DB_POOL_SIZE / DB_MAX_OVERFLOW under load
+@router.get("/db_pool", response_model=DBPoolStatsOut, response_model_exclude_none=True)
+def get_db_pool_stats():
+    stats = {"sync": pool_stats(engine), "async": pool_stats(async_engine.sync_engine)}
+    if replica_engine is not None:
+        stats["replica"] = pool_stats(replica_engine.sync_engine)
+    return stats
+
+# 🔐 Password hashing pool: queue depth tells us when logins are CPU-bound
+@router.get("/hashing_pool", response_model=HashingPoolStatsOut)
+def get_hashing_pool_stats():
+    return hashing_pool.stats()
+
+# 📦 Streaming export for analytics: table is chapter_progress, progress, badges or all
+@router.get("/export/{table}")
+def export_progress(table: str, format: str = "ndjson", gzip: bool = False):
+    try:
+        chunks = export_stream(table, format, gzip)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    media_type = "application/x-ndjson" if format == "ndjson" else "text/csv"
+    filename = f"{table}.{format}" + (".gz" if gzip else "")
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if gzip:
+        # Served as a .gz file, not transparently decoded by the client
+        media_type = "application/gzip"
+    return StreamingResponse(chunks, media_type=media_type, headers=headers)
+
+# 🎁 Reward catalog management; every change rebuilds this worker's alias tables
+class GiftRequest(BaseModel):
+    gift_name: str
+    gift_type: str
+    weight: int = 1
+
+class BigMotivatorRequest(BaseModel):
+    motivator_name: str
+    weight: int = 1
+
+@router.post("/gifts", response_model=CreatedOut)
+async def add_gift(request: GiftRequest, db: AsyncSession = Depends(get_db)):
+    gift = Gift(gift_name=request.gift_name, gift_type=request.gift_type, weight=request.weight)
+    db.add(gift)
+    await db.commit()
+    reward_catalog.invalidate()
+    return {"message": "Gift added.", "id": gift.id}
+
+@router.post("/big_motivators", response_model=CreatedOut)
+async def add_big_motivator(request: BigMotivatorRequest, db: AsyncSession = Depends(get_db)):
+    motivator = BigMotivator(motivator_name=request.motivator_name, weight=request.weight)
+    db.add(motivator)
+    await db.commit()
+    reward_catalog.invalidate()
+    return {"message": "Big motivator added.", "id": motivator.id}
+
+# 📚 Lesson content; every change bumps content_version so all workers drop their cached pages
+class LessonRequest(BaseModel):
+    topic: str
+    level: str
+    title: str
+    summary: Optional[str] = None
+    body: Optional[str] = None
+    content_type: str = "lesson"
+
+@router.post("/lessons", response_model=CreatedOut)
+async def add_lesson(request: LessonRequest, db: AsyncSession = Depends(get_db)):
+    lesson = Content(**request.model_dump())
+    db.add(lesson)
+    await db.flush()
+    await lesson_catalog.bump(db)
+    await db.commit()
+    lesson_catalog.invalidate()
+    return {"message": "Lesson added.", "id": lesson.id}
+
+# For content loaded straight into the table (bulk SQL, migrations)
+@router.post("/lessons/bump_version", response_model=MessageOut)
+async def bump_content_version(db: AsyncSession = Depends(get_db)):
+    await lesson_catalog.bump(db)
+    await db.commit()
+    lesson_catalog.invalidate()
+    return {"message": "Content version bumped."}
@@ -1,12 +1,20 @@
+from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
-from database import SessionLocal
-from models import User
+from credentials import HashingPoolSaturated, hash_password, hashing_pool, needs_rehash, verify_password, verify_unknown_user
+from database import dialect_insert
+from metrics import TimedORJSONResponse
+from models import RevokedToken, User
+from schemas import AuthOut, MessageOut
+from sessions import get_db
+from tokens import current_token, issue_token, revocations
 
 router = APIRouter(
     prefix="/auth",
-    tags=["Auth"]
+    tags=["Auth"],
+    default_response_class=TimedORJSONResponse
 )
 
 class SignupRequest(BaseModel):
@@ -14,34 +22,65 @@ class SignupRequest(BaseModel):
     username: str
     password: str
 
-def get_db():
-    db = SessionLocal()
+async def run_hashing(fn, *args):
     try:
-        yield db
-    finally:
-        db.close()
-
-@router.post("/signup")
-def signup(request: SignupRequest, db: Session = Depends(get_db)):
-    existing_user = db.query(User).filter((User.email == request.email) | (User.username == request.username)).first()
-    if existing_user:
-        raise HTTPException(status_code=400, detail="User already exists.")
-
-    new_user = User(
-        email=request.email,
-        username=request.username,
-        password=request.password
+        return await hashing_pool.run(fn, *args)
+    except HashingPoolSaturated:
+        raise HTTPException(status_code=503, detail="Too many sign-ins right now, please retry.", headers={"Retry-After": "1"})
+
+async def conflicting_column(db: AsyncSession, email: str, username: str):
+    """Only runs after a failed insert, to say which unique column collided."""
+    result = await db.execute(select(User.email == email).where((User.email == email) | (User.username == username)))
+    email_taken = result.scalar()
+    if email_taken is None:
+        return None
+    return "email" if email_taken else "username"
+
+@router.post("/signup", response_model=AuthOut)
+async def signup(request: SignupRequest, db: AsyncSession = Depends(get_db)):
+    password_hash = await run_hashing(hash_password, request.password)
+
+    # One statement: the unique constraints on email/username do the duplicate check
+    result = await db.execute(
+        dialect_insert(User)
+        .values(email=request.email, username=request.username, password=password_hash)
+        .on_conflict_do_nothing()
+        .returning(User.id)
     )
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    user_id = result.scalar()
+    if user_id is None:
+        column = await conflicting_column(db, request.email, request.username)
+        detail = {"email": "Email already registered.", "username": "Username already taken."}.get(column, "User already exists.")
+        raise HTTPException(status_code=400, detail=detail)
+    await db.commit()
 
-    return {"message": "User created successfully.", "user_id": new_user.id}
+    return {"message": "User created successfully.", "user_id": user_id, "token": issue_token(user_id)}
 
-@router.post("/login")
-def login(email: str, password: str, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == email).first()
-    if not user or user.password != password:
+@router.post("/login", response_model=AuthOut)
+async def login(email: str, password: str, db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(User).where(User.email == email))
+    user = result.scalars().first()
+    if user is None:
+        await run_hashing(verify_unknown_user, password)
+        raise HTTPException(status_code=401, detail="Invalid email or password.")
+    if not await run_hashing(verify_password, password, user.password):
         raise HTTPException(status_code=401, detail="Invalid email or password.")
 
-    return {"message": "Login successful", "user_id": user.id}
+    # Upgrade plaintext (pre-hashing) rows and outdated parameters transparently
+    if needs_rehash(user.password):
+        user.password = await run_hashing(hash_password, password)
+        await db.commit()
+
+    return {"message": "Login successful", "user_id": user.id, "token": issue_token(user.id)}
+
+@router.post("/logout", response_model=MessageOut)
+async def logout(token=Depends(current_token), db: AsyncSession = Depends(get_db)):
+    _, expires_at, jti = token
+    await db.execute(
+        dialect_insert(RevokedToken)
+        .values(jti=jti, expires_at=datetime.fromtimestamp(expires_at, timezone.utc))
+        .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+    )
+    await db.commit()
+    revocations.revoke(jti, expires_at)
+    return {"message": "Logged out."}
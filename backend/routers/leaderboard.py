@@ -0,0 +1,65 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from leaderboard import GLOBAL_BOARD, leaderboards, topic_board, weekly_board
+from metrics import TimedORJSONResponse
+from models import User
+from paths import path_topics
+from schemas import LeaderboardEntryOut, RankOut
+from sessions import get_replica_db
+
+router = APIRouter(
+    prefix="/leaderboard",
+    tags=["Leaderboard"],
+    default_response_class=TimedORJSONResponse
+)
+
+async def top_entries(db: AsyncSession, board: str, limit: int):
+    top = leaderboards.top(board, limit)
+    if not top:
+        return []
+    # One small PK lookup for display names; ranking itself never touches the DB
+    result = await db.execute(select(User.id, User.username).where(User.id.in_([user_id for user_id, _ in top])))
+    usernames = dict(result.all())
+    return [
+        {"rank": i + 1, "user_id": user_id, "username": usernames.get(user_id), "score": score}
+        for i, (user_id, score) in enumerate(top)
+    ]
+
+# 🏆 Top-N boards
+@router.get("/global", response_model=List[LeaderboardEntryOut])
+async def global_leaderboard(limit: int = Query(10, ge=1, le=100), db: AsyncSession = Depends(get_replica_db)):
+    return await top_entries(db, GLOBAL_BOARD, limit)
+
+@router.get("/weekly", response_model=List[LeaderboardEntryOut])
+async def weekly_leaderboard(limit: int = Query(10, ge=1, le=100), db: AsyncSession = Depends(get_replica_db)):
+    return await top_entries(db, weekly_board(), limit)
+
+@router.get("/topic/{topic}", response_model=List[LeaderboardEntryOut])
+async def topic_leaderboard(topic: str, limit: int = Query(10, ge=1, le=100), db: AsyncSession = Depends(get_replica_db)):
+    return await top_entries(db, topic_board(topic), limit)
+
+# Everyone learning the same topic as this path, not just the path's owner
+@router.get("/path/{path_id}", response_model=List[LeaderboardEntryOut])
+async def path_leaderboard(path_id: int, limit: int = Query(10, ge=1, le=100), db: AsyncSession = Depends(get_replica_db)):
+    topic = (await path_topics(db, [path_id])).get(path_id)
+    if topic is None:
+        raise HTTPException(status_code=404, detail="Learning path not found.")
+    return await top_entries(db, topic_board(topic), limit)
+
+# 🏆 "My rank": board is global, weekly, topic:<topic> or path:<path_id> (that path's topic)
+@router.get("/rank/{user_id}", response_model=RankOut)
+async def my_rank(user_id: int, board: str = "global", db: AsyncSession = Depends(get_replica_db)):
+    name = weekly_board() if board == "weekly" else board
+    if name.startswith("path:") and name[5:].isdigit():
+        topic = (await path_topics(db, [int(name[5:])])).get(int(name[5:]))
+        if topic is None:
+            raise HTTPException(status_code=404, detail="Learning path not found.")
+        name = topic_board(topic)
+    if name != GLOBAL_BOARD and not name.startswith(("weekly:", "topic:")):
+        raise HTTPException(status_code=400, detail="board must be global, weekly, topic:<topic> or path:<path_id>.")
+    rank = leaderboards.rank(name, user_id)
+    if rank is None:
+        return {"board": name, "rank": None, "score": 0, "total": leaderboards.size(name)}
+    return {"board": name, **rank}
@@ -1,23 +1,53 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from database import SessionLocal
-from models import Content
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from cache import etag_matches
+from lesson_catalog import lesson_catalog, parse_fields
+from sessions import get_replica_db
 
 router = APIRouter(
     prefix="/lessons",
     tags=["Lessons"]
 )
 
-# Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+MAX_PAGE_SIZE = 200
+
+
+def lesson_response(request: Request, body: bytes, etag: str, headers=None):
+    headers = {**(headers or {}), "ETag": etag}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
-# 🚀 API to list all lessons
+
+# 🚀 API to list lessons, one keyset page at a time
 @router.get("/")
-def list_lessons(db: Session = Depends(get_db)):
-    lessons = db.query(Content).all()
-    return lessons
+async def list_lessons(
+    request: Request,
+    topic: Optional[str] = None,
+    level: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns, e.g. id,title,level"),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_replica_db)
+):
+    try:
+        columns = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(400, detail=str(e))
+    try:
+        after = int(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(400, detail="Invalid cursor.")
+
+    body, etag, next_cursor = await lesson_catalog.page(db, topic, level, columns, after, limit)
+    return lesson_response(request, body, etag, {"X-Next-Cursor": next_cursor} if next_cursor else None)
+
+
+# 🚀 Full lesson, body included
+@router.get("/{lesson_id}")
+async def get_lesson(request: Request, lesson_id: int, db: AsyncSession = Depends(get_replica_db)):
+    entry = await lesson_catalog.lesson(db, lesson_id)
+    if entry is None:
+        raise HTTPException(404, detail="Lesson not found.")
+    return lesson_response(request, *entry)
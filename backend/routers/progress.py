@@ -1,104 +1,331 @@
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from database import SessionLocal
-from models import UserProgress, UserChapterProgress, UserBadges
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import case, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from badges import badge_engine
+from cache import cached_json, invalidate_user
+from database import dialect_insert
+from leaderboard import leaderboards
+from catalog import catalog_store, chapter_counts
+from metrics import TimedORJSONResponse
+from models import CatalogDocument, LearningPath, PathProgressSummary, UserProgress, UserChapterProgress, UserBadges, CHAPTER_PROGRESS_KEY
+from paths import path_topics
+from schemas import BadgeOut, BulkCompletionOut, ChapterCompletionOut, CompletedChapterOut, PathSummaryOut, ProgressOut
+from sessions import get_db, get_read_db
+from streaks import streak_columns
+from tokens import require_user
 
 router = APIRouter(
     prefix="/progress",
-    tags=["Progress"]
+    tags=["Progress"],
+    default_response_class=TimedORJSONResponse,
+    dependencies=[Depends(require_user)]  # 🔐 token must match {user_id}
 )
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-# 🎯 Badge thresholds
-BADGE_THRESHOLDS = {
-    100: "Beginner Badge 🥉",
-    250: "Intermediate Badge 🥈",
-    500: "Advanced Badge 🥇",
-    1000: "Expert Badge 🏆"
-}
-
 # 🎯 Input Model for Chapter Completion
 class ChapterCompletionRequest(BaseModel):
     experience_level: str
 
+# 🎯 Input Models for batched (e.g. offline) completions
+class ChapterCompletion(BaseModel):
+    path_id: int
+    step: int
+    chapter: int
+    experience_level: str
+
+class BulkChapterCompletionRequest(BaseModel):
+    completions: List[ChapterCompletion]
+
+MAX_BULK_COMPLETIONS = 500
+
+# Serializers for the cached reads, built once
+progress_adapter = TypeAdapter(ProgressOut)
+badges_adapter = TypeAdapter(List[BadgeOut])
+completed_adapter = TypeAdapter(List[CompletedChapterOut])
+summary_adapter = TypeAdapter(List[PathSummaryOut])
+
 # 🎯 Get user progress
-@router.get("/{user_id}")
-def get_user_progress(user_id: int, db: Session = Depends(get_db)):
-    progress = db.query(UserProgress).filter(UserProgress.user_id == user_id).first()
-    if not progress:
-        raise HTTPException(status_code=404, detail="Progress not found for user.")
-    return progress
+@router.get("/{user_id}", response_model=ProgressOut)
+async def get_user_progress(user_id: int, request: Request, db: AsyncSession = Depends(get_read_db)):
+    async def load():
+        result = await db.execute(select(UserProgress).where(UserProgress.user_id == user_id))
+        progress = result.scalars().first()
+        if not progress:
+            raise HTTPException(status_code=404, detail="Progress not found for user.")
+        return progress
+
+    return await cached_json(request, user_id, "progress", load, progress_adapter)
+
+XP_PER_CHAPTER = 20  # ✅ Add 20 XP per chapter
+
+
+async def award_xp(db: AsyncSession, user_id: int, delta: int, lessons: int = 0):
+    """Atomically add XP/lessons, advance the streak and award any badges crossed; returns the new XP."""
+    streak_insert, streak_update = streak_columns()
+    result = await db.execute(
+        dialect_insert(UserProgress)
+        .values(user_id=user_id, xp=delta, lessons_completed=lessons, **streak_insert)
+        .on_conflict_do_update(
+            index_elements=[UserProgress.user_id],
+            set_={
+                "xp": func.coalesce(UserProgress.xp, 0) + delta,
+                "lessons_completed": func.coalesce(UserProgress.lessons_completed, 0) + lessons,
+                **streak_update
+            }
+        )
+        .returning(UserProgress.xp, UserProgress.lessons_completed, UserProgress.streak_count, UserProgress.badge_mask)
+    )
+    progress = result.one()
+    new = {"xp": progress.xp, "lessons_completed": progress.lessons_completed, "streak_count": progress.streak_count}
+    old = {"xp": progress.xp - delta, "lessons_completed": progress.lessons_completed - lessons}
+
+    # Common case: no threshold crossed, so no further statements
+    earned = badge_engine.newly_earned(old, new, progress.badge_mask or 0)
+    if earned:
+        await db.execute(
+            dialect_insert(UserBadges)
+            .values([{"user_id": user_id, "badge_name": rule.name} for rule in earned])
+            .on_conflict_do_nothing(index_elements=[UserBadges.user_id, UserBadges.badge_name])
+        )
+        bits = badge_engine.mask_for(rule.name for rule in earned)
+        await db.execute(
+            update(UserProgress)
+            .where(UserProgress.user_id == user_id)
+            .values(badge_mask=func.coalesce(UserProgress.badge_mask, 0).op("|")(bits))
+        )
+    return progress.xp
+
+
+async def bump_summaries(db: AsyncSession, user_id: int, chapters):
+    """Add newly completed (path_id, step, chapter, level) rows to path_progress_summary in one upsert."""
+    counts = {}
+    for path_id, step, _, experience_level in chapters:
+        key = (path_id, step, experience_level)
+        counts[key] = counts.get(key, 0) + 1
+    stmt = dialect_insert(PathProgressSummary).values([
+        {
+            "user_id": user_id,
+            "learning_path_id": path_id,
+            "step_number": step,
+            "experience_level": experience_level,
+            "completed_chapters": count
+        }
+        for (path_id, step, experience_level), count in counts.items()
+    ])
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[
+            PathProgressSummary.user_id,
+            PathProgressSummary.learning_path_id,
+            PathProgressSummary.step_number,
+            PathProgressSummary.experience_level
+        ],
+        set_={"completed_chapters": PathProgressSummary.completed_chapters + stmt.excluded.completed_chapters}
+    ))
 
-# 🎯 Complete chapter + Add XP + Award Badges
-@router.post("/complete_chapter/{user_id}/{path_id}/{step}/{chapter}")
-def complete_chapter(user_id: int, path_id: int, step: int, chapter: int, request: ChapterCompletionRequest, db: Session = Depends(get_db)):
-    # Check if chapter for that experience already completed
-    existing = db.query(UserChapterProgress).filter_by(
-        user_id=user_id,
-        learning_path_id=path_id,
-        step_number=step,
-        chapter_number=chapter,
-        experience_level=request.experience_level
-    ).first()
-
-    if existing:
-        return {"message": "Chapter already completed for this experience level."}
 
-    # Save new completed chapter
-    new_record = UserChapterProgress(
-        user_id=user_id,
-        learning_path_id=path_id,
-        step_number=step,
-        chapter_number=chapter,
-        experience_level=request.experience_level
+def percent(completed, total):
+    return round(min(completed, total) * 100.0 / total, 1) if total else None
+
+
+async def record_chapter(db: AsyncSession, user_id: int, path_id: int, step: int, chapter: int, experience_level: str, topic=None):
+    """Mark one chapter complete and award its XP; returns the new XP, or None if it was already completed.
+
+    `topic` is the path's topic name when the caller already knows it (saves a lookup for the topic board).
+    """
+    # Unique key makes the insert a no-op if this chapter was already completed
+    result = await db.execute(
+        dialect_insert(UserChapterProgress)
+        .values(
+            user_id=user_id,
+            learning_path_id=path_id,
+            step_number=step,
+            chapter_number=chapter,
+            experience_level=experience_level
+        )
+        .on_conflict_do_nothing(index_elements=CHAPTER_PROGRESS_KEY)
+        .returning(UserChapterProgress.id)
     )
-    db.add(new_record)
+    if result.first() is None:
+        return None
 
-    # Update XP
-    progress = db.query(UserProgress).filter(UserProgress.user_id == user_id).first()
-    if not progress:
-        progress = UserProgress(user_id=user_id, xp=0)
-        db.add(progress)
+    current_xp = await award_xp(db, user_id, XP_PER_CHAPTER, lessons=1)
+    await bump_summaries(db, user_id, [(path_id, step, chapter, experience_level)])
+    if topic is None:
+        topic = (await path_topics(db, [path_id])).get(path_id)
+    await db.commit()
+    await invalidate_user(user_id)
+    leaderboards.record(user_id, current_xp, {topic: XP_PER_CHAPTER} if topic else {})
+    return current_xp
 
-    progress.xp += 20  # ✅ Add 20 XP per chapter
 
-    # Award badges if thresholds crossed
-    earned_badges = db.query(UserBadges).filter(UserBadges.user_id == user_id).all()
-    earned_badge_names = [badge.badge_name for badge in earned_badges]
+# 🎯 Complete chapter + Add XP + Award Badges
+@router.post("/complete_chapter/{user_id}/{path_id}/{step}/{chapter}", response_model=ChapterCompletionOut, response_model_exclude_none=True)
+async def complete_chapter(user_id: int, path_id: int, step: int, chapter: int, request: ChapterCompletionRequest, db: AsyncSession = Depends(get_db)):
+    current_xp = await record_chapter(db, user_id, path_id, step, chapter, request.experience_level)
+    if current_xp is None:
+        return {"message": "Chapter already completed for this experience level."}
+    return {"message": "Chapter completed successfully!", "current_xp": current_xp}
 
-    for xp_needed, badge_name in BADGE_THRESHOLDS.items():
-        if progress.xp >= xp_needed and badge_name not in earned_badge_names:
-            new_badge = UserBadges(user_id=user_id, badge_name=badge_name)
-            db.add(new_badge)
+# 🎯 Complete many chapters at once: one insert, one XP update, one badge check
+@router.post("/complete_chapters/{user_id}", response_model=BulkCompletionOut)
+async def complete_chapters(user_id: int, request: BulkChapterCompletionRequest, db: AsyncSession = Depends(get_db)):
+    if len(request.completions) > MAX_BULK_COMPLETIONS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_COMPLETIONS} completions per request.")
 
-    db.commit()
-    db.refresh(progress)
+    keys = list(dict.fromkeys((c.path_id, c.step, c.chapter, c.experience_level) for c in request.completions))
+    inserted = set()
+    if keys:
+        result = await db.execute(
+            dialect_insert(UserChapterProgress)
+            .values([
+                {
+                    "user_id": user_id,
+                    "learning_path_id": path_id,
+                    "step_number": step,
+                    "chapter_number": chapter,
+                    "experience_level": experience_level
+                }
+                for path_id, step, chapter, experience_level in keys
+            ])
+            .on_conflict_do_nothing(index_elements=CHAPTER_PROGRESS_KEY)
+            .returning(
+                UserChapterProgress.learning_path_id,
+                UserChapterProgress.step_number,
+                UserChapterProgress.chapter_number,
+                UserChapterProgress.experience_level
+            )
+        )
+        inserted = {tuple(row) for row in result}
 
-    return {"message": "Chapter completed successfully!", "current_xp": progress.xp}
+    if inserted:
+        current_xp = await award_xp(db, user_id, XP_PER_CHAPTER * len(inserted), lessons=len(inserted))
+        await bump_summaries(db, user_id, inserted)
+        topics = await path_topics(db, {path_id for path_id, _, _, _ in inserted})
+        await db.commit()
+        await invalidate_user(user_id)
+        topic_xp = {}
+        for path_id, _, _, _ in inserted:
+            topic = topics.get(path_id)
+            if topic:
+                topic_xp[topic] = topic_xp.get(topic, 0) + XP_PER_CHAPTER
+        leaderboards.record(user_id, current_xp, topic_xp)
+    else:
+        result = await db.execute(select(UserProgress.xp).where(UserProgress.user_id == user_id))
+        current_xp = result.scalar() or 0
+
+    results = []
+    for c in request.completions:
+        key = (c.path_id, c.step, c.chapter, c.experience_level)
+        # Only the first occurrence of a newly inserted key counts as completed
+        status = "completed" if key in inserted else "already_completed"
+        inserted.discard(key)
+        results.append({
+            "path_id": c.path_id,
+            "step": c.step,
+            "chapter": c.chapter,
+            "experience_level": c.experience_level,
+            "status": status
+        })
+
+    return {"message": "Chapters processed.", "current_xp": current_xp, "results": results}
 
 # 🎯 Get user badges
-@router.get("/badges/{user_id}")
-def get_user_badges(user_id: int, db: Session = Depends(get_db)):
-    badges = db.query(UserBadges).filter(UserBadges.user_id == user_id).all()
-    return badges
+@router.get("/badges/{user_id}", response_model=List[BadgeOut])
+async def get_user_badges(user_id: int, request: Request, db: AsyncSession = Depends(get_read_db)):
+    async def load():
+        result = await db.execute(select(UserBadges).where(UserBadges.user_id == user_id))
+        return result.scalars().all()
+
+    return await cached_json(request, user_id, "badges", load, badges_adapter)
 
 # 🎯 Get completed chapters for user
-@router.get("/completed/{user_id}")
-def get_completed_chapters(user_id: int, db: Session = Depends(get_db)):
-    completed = db.query(UserChapterProgress).filter(UserChapterProgress.user_id == user_id).all()
-    return [
-        {
-            "path_id": c.learning_path_id,
-            "step": c.step_number,
-            "chapter": c.chapter_number,
-            "experience_level": c.experience_level
-        }
-        for c in completed
-    ]
+@router.get("/completed/{user_id}", response_model=List[CompletedChapterOut])
+async def get_completed_chapters(user_id: int, request: Request, db: AsyncSession = Depends(get_read_db)):
+    async def load():
+        result = await db.execute(select(UserChapterProgress).where(UserChapterProgress.user_id == user_id))
+        completed = result.scalars().all()
+        return [
+            {
+                "path_id": c.learning_path_id,
+                "step": c.step_number,
+                "chapter": c.chapter_number,
+                "experience_level": c.experience_level
+            }
+            for c in completed
+        ]
+
+    return await cached_json(request, user_id, "completed", load, completed_adapter)
+
+
+# 🎯 Per-path / per-step completion percentages (replaces client-side math over /completed)
+@router.get("/summary/{user_id}", response_model=List[PathSummaryOut])
+async def get_completion_summary(user_id: int, request: Request, db: AsyncSession = Depends(get_read_db)):
+    async def load():
+        result = await db.execute(
+            select(
+                PathProgressSummary.learning_path_id,
+                PathProgressSummary.step_number,
+                PathProgressSummary.experience_level,
+                PathProgressSummary.completed_chapters,
+                LearningPath.path_name,
+                LearningPath.catalog_hash,
+                # Legacy rows only; catalog rows get their counts from memory
+                case((LearningPath.catalog_hash.is_(None), LearningPath.path_json)).label("path_json")
+            )
+            .outerjoin(LearningPath, LearningPath.id == PathProgressSummary.learning_path_id)
+            .where(PathProgressSummary.user_id == user_id)
+            .order_by(PathProgressSummary.learning_path_id, PathProgressSummary.experience_level, PathProgressSummary.step_number)
+        )
+
+        rows = result.all()
+
+        catalog = catalog_store.current
+        retired_counts = {}
+        retired = {row.catalog_hash for row in rows if row.catalog_hash and catalog.by_hash(row.catalog_hash) is None}
+        if retired:
+            # Versions edited out of (or reloaded away from) the catalog are still stored
+            documents = await db.execute(
+                select(CatalogDocument.content_hash, CatalogDocument.document)
+                .where(CatalogDocument.content_hash.in_(retired))
+            )
+            retired_counts = {content_hash: chapter_counts(document) for content_hash, document in documents}
+
+        paths = {}
+        step_totals = {}
+        for row in rows:
+            key = (row.learning_path_id, row.experience_level)
+            summary = paths.get(key)
+            if summary is None:
+                topic = catalog.by_hash(row.catalog_hash) if row.catalog_hash else None
+                if topic is not None:
+                    counts = topic.chapter_counts
+                elif row.catalog_hash:
+                    counts = retired_counts.get(row.catalog_hash)
+                elif row.path_json:
+                    counts = chapter_counts(row.path_json)
+                else:
+                    counts = None
+                step_totals[key] = counts or {}
+                summary = paths[key] = {
+                    "path_id": row.learning_path_id,
+                    "path_name": row.path_name,
+                    "experience_level": row.experience_level,
+                    "completed": 0,
+                    "total": sum(counts.values()) if counts else None,
+                    "steps": []
+                }
+            total = step_totals[key].get(row.step_number)
+            summary["completed"] += row.completed_chapters
+            summary["steps"].append({
+                "step": row.step_number,
+                "completed": row.completed_chapters,
+                "total": total,
+                "percent": percent(row.completed_chapters, total)
+            })
+
+        for summary in paths.values():
+            summary["percent"] = percent(summary["completed"], summary["total"])
+        return list(paths.values())
+
+    return await cached_json(request, user_id, "summary", load, summary_adapter)
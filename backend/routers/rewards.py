@@ -1,65 +1,64 @@
+from typing import List
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-import random
-from database import SessionLocal
-from models import UserReward, Gift, BigMotivator
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import dialect_insert
+from metrics import TimedORJSONResponse
+from models import UserProgress, UserReward
+from reward_catalog import reward_catalog
+from schemas import GiftClaimOut, MotivatorClaimOut, RewardOut
+from sessions import get_db, get_read_db
+from tokens import require_user
 
 router = APIRouter(
     prefix="/rewards",
-    tags=["Rewards"]
+    tags=["Rewards"],
+    default_response_class=TimedORJSONResponse,
+    dependencies=[Depends(require_user)]  # 🔐 token must match {user_id}
 )
 
-# Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+GIFTS_FOR_BIG_MOTIVATOR = 5
 
 # 🚀 1. Claim a small gift
-@router.post("/claim_gift/{user_id}")
-def claim_gift(user_id: int, db: Session = Depends(get_db)):
-    # Pick random gift from catalog
-    gift = db.query(Gift).order_by(func.random()).first()
+@router.post("/claim_gift/{user_id}", response_model=GiftClaimOut)
+async def claim_gift(user_id: int, db: AsyncSession = Depends(get_db)):
+    # Pick random gift from the in-memory weighted catalog (no ORDER BY random())
+    gift = await reward_catalog.pick_gift(db)
     if not gift:
         raise HTTPException(status_code=404, detail="No gifts available")
+    gift_name, gift_type = gift
 
-    user_reward = UserReward(
-        user_id=user_id,
-        reward_type=gift.gift_type,
-        reward_name=gift.gift_name
+    db.add(UserReward(user_id=user_id, reward_type=gift_type, reward_name=gift_name))
+    await db.execute(
+        dialect_insert(UserProgress)
+        .values(user_id=user_id, gifts_claimed=1)
+        .on_conflict_do_update(
+            index_elements=[UserProgress.user_id],
+            set_={"gifts_claimed": UserProgress.gifts_claimed + 1}
+        )
     )
-    db.add(user_reward)
-    db.commit()
-    db.refresh(user_reward)
+    await db.commit()
 
-    return {"message": "Gift claimed!", "reward": gift.gift_name}
+    return {"message": "Gift claimed!", "reward": gift_name}
 
 # 🚀 2. Claim a BIG motivator (after getting 5+ gifts)
-@router.post("/claim_big_motivator/{user_id}")
-def claim_big_motivator(user_id: int, db: Session = Depends(get_db)):
-    user_gifts = db.query(UserReward).filter(UserReward.user_id == user_id).count()
-    if user_gifts < 5:
+@router.post("/claim_big_motivator/{user_id}", response_model=MotivatorClaimOut)
+async def claim_big_motivator(user_id: int, db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(UserProgress.gifts_claimed).where(UserProgress.user_id == user_id))
+    if (result.scalar() or 0) < GIFTS_FOR_BIG_MOTIVATOR:
         raise HTTPException(status_code=400, detail="Need 5+ small gifts to unlock big motivator.")
 
-    big_motivator = db.query(BigMotivator).order_by(func.random()).first()
-    if not big_motivator:
+    motivator_name = await reward_catalog.pick_motivator(db)
+    if not motivator_name:
         raise HTTPException(status_code=404, detail="No big motivators available")
 
-    user_reward = UserReward(
-        user_id=user_id,
-        reward_type="big_motivator",
-        reward_name=big_motivator.motivator_name
-    )
-    db.add(user_reward)
-    db.commit()
-    db.refresh(user_reward)
+    db.add(UserReward(user_id=user_id, reward_type="big_motivator", reward_name=motivator_name))
+    await db.commit()
 
-    return {"message": "BIG motivator unlocked!", "motivator": big_motivator.motivator_name}
+    return {"message": "BIG motivator unlocked!", "motivator": motivator_name}
 
 # 🚀 3. View user's collected rewards
-@router.get("/my_rewards/{user_id}")
-def my_rewards(user_id: int, db: Session = Depends(get_db)):
-    rewards = db.query(UserReward).filter(UserReward.user_id == user_id).all()
-    return rewards
+@router.get("/my_rewards/{user_id}", response_model=List[RewardOut])
+async def my_rewards(user_id: int, db: AsyncSession = Depends(get_read_db)):
+    result = await db.execute(select(UserReward).where(UserReward.user_id == user_id).order_by(UserReward.id))
+    return result.scalars().all()
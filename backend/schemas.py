@@ -0,0 +1,176 @@
+from datetime import datetime
+from typing import Any, List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class ORMModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+
+# 🎯 Progress
+class ProgressOut(ORMModel):
+    id: int
+    user_id: int
+    xp: int
+    lessons_completed: int
+    streak_count: int
+    last_lesson_date: Optional[datetime] = None
+    badge_mask: int
+
+
+class BadgeOut(ORMModel):
+    id: int
+    user_id: int
+    badge_name: str
+    earned_at: Optional[datetime] = None
+
+
+class CompletedChapterOut(BaseModel):
+    path_id: int
+    step: int
+    chapter: int
+    experience_level: str
+
+
+class ChapterCompletionOut(BaseModel):
+    message: str
+    current_xp: Optional[int] = None
+
+
+class StepSummaryOut(BaseModel):
+    step: int
+    completed: int
+    total: Optional[int] = None
+    percent: Optional[float] = None
+
+
+class PathSummaryOut(BaseModel):
+    path_id: int
+    path_name: Optional[str] = None
+    experience_level: str
+    completed: int
+    total: Optional[int] = None  # None when the path's chapter count is unknown
+    percent: Optional[float] = None
+    steps: List[StepSummaryOut]
+
+
+class BulkCompletionItemOut(CompletedChapterOut):
+    status: str  # "completed" or "already_completed"
+
+
+class BulkCompletionOut(BaseModel):
+    message: str
+    current_xp: int
+    results: List[BulkCompletionItemOut]
+
+
+# 🎯 Learning paths
+class LearningPathGenerateOut(BaseModel):
+    message: str
+    path: List[Any]
+
+
+class GradeOut(BaseModel):
+    correct: int
+    total: int
+    passed: bool
+    results: List[bool]  # per question, in quiz order
+    chapter_completed: Optional[bool] = None  # only when path_id and experience_level were sent and the quiz's chapter exists
+    current_xp: Optional[int] = None
+
+
+class LearningPathSummaryOut(BaseModel):
+    id: int
+    path_name: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+
+class LearningPathOut(LearningPathSummaryOut):
+    user_id: int
+    path_json: Any = None
+    catalog_hash: Optional[str] = None
+
+
+# 🎯 Leaderboard
+class LeaderboardEntryOut(BaseModel):
+    rank: int
+    user_id: int
+    username: Optional[str] = None
+    score: int
+
+
+class RankOut(BaseModel):
+    board: str  # resolved name, e.g. "weekly:2025-W07"
+    rank: Optional[int] = None  # None when the user isn't on the board
+    score: int
+    total: int
+
+
+# 🎯 Rewards
+class RewardOut(ORMModel):
+    id: int
+    user_id: int
+    reward_type: str
+    reward_name: str
+    claimed_at: Optional[datetime] = None
+
+
+class GiftClaimOut(BaseModel):
+    message: str
+    reward: str
+
+
+class MotivatorClaimOut(BaseModel):
+    message: str
+    motivator: str
+
+
+# 🎯 Auth
+class AuthOut(BaseModel):
+    message: str
+    user_id: int
+    token: str
+
+
+class MessageOut(BaseModel):
+    message: str
+
+
+# 🎯 Admin
+class CreatedOut(MessageOut):
+    id: int
+
+
+class PoolStatsOut(BaseModel):
+    pool_class: str
+    status: str
+    # QueuePool only
+    size: Optional[int] = None
+    checked_in: Optional[int] = None
+    checked_out: Optional[int] = None
+    overflow: Optional[int] = None
+    max_overflow: Optional[int] = None
+    # Timed pools only
+    checkouts: Optional[int] = None
+    wait_total_ms: Optional[float] = None
+    wait_avg_ms: Optional[float] = None
+    wait_max_ms: Optional[float] = None
+
+
+class DBPoolStatsOut(BaseModel):
+    sync: PoolStatsOut
+    async_: PoolStatsOut = Field(alias="async")
+    replica: Optional[PoolStatsOut] = None  # only with READ_REPLICA_URL
+
+
+class HashingPoolStatsOut(BaseModel):
+    scheme: str
+    workers: int
+    queue_limit: int
+    in_flight: int
+    queue_depth: int
+    max_pending: int
+    completed: int
+    rejected: int
+    avg_ms: float
@@ -0,0 +1,70 @@
+import os
+from contextlib import asynccontextmanager
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import config  # noqa: F401  (loads .env before any setting below is read)
+from database import AsyncSessionLocal, async_engine, engine_options, to_async_url
+
+# 📖 Optional read replica for lag-tolerant GETs (e.g. postgresql://reader@replica-host/railway)
+READ_REPLICA_URL = os.getenv("READ_REPLICA_URL")
+
+
+def _read_only_sessionmaker(engine):
+    """Sessions whose transactions open with BEGIN READ ONLY on Postgres (no extra round trip; a no-op elsewhere).
+
+    The option engine shares `engine`'s pool; the flag is reset when a connection goes back to it.
+    """
+    if engine.dialect.name == "postgresql":
+        engine = engine.execution_options(postgresql_readonly=True)
+    return async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+
+ReadOnlySessionLocal = _read_only_sessionmaker(async_engine)
+
+replica_engine = None
+ReplicaSessionLocal = ReadOnlySessionLocal
+if READ_REPLICA_URL:
+    replica_url = to_async_url(READ_REPLICA_URL)
+    replica_engine = create_async_engine(replica_url, **engine_options(replica_url))
+    ReplicaSessionLocal = _read_only_sessionmaker(replica_engine)
+
+
+# 🔌 Request dependencies. Sessions check out a connection on their first statement,
+# so an endpoint answered from cache never touches the pool.
+async def get_db():
+    """Read-write session on the primary; the endpoint commits."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_read_db():
+    """Read-only session on the primary, for reads that must see the caller's own writes."""
+    async with ReadOnlySessionLocal() as db:
+        yield db
+
+
+async def get_replica_db():
+    """Read-only session on READ_REPLICA_URL (the primary when unset). Only for data where replica lag is harmless."""
+    async with ReplicaSessionLocal() as db:
+        yield db
+
+
+# 🧱 Unit of work for code outside a request (background tasks, startup)
+@asynccontextmanager
+async def unit_of_work(read_only=False):
+    """Commits if the block finishes, rolls back if it raises."""
+    async with (ReadOnlySessionLocal if read_only else AsyncSessionLocal)() as db:
+        try:
+            yield db
+            if not read_only:
+                await db.commit()
+        except BaseException:
+            await db.rollback()
+            raise
+
+
+async def dispose_engines():
+    await async_engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
@@ -0,0 +1,59 @@
+import os
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import case, func, or_, update
+
+import config  # noqa: F401  (loads .env before any setting below is read)
+from models import UserProgress
+
+# Day boundaries for streaks are midnights in this zone (DST handled by zoneinfo)
+STREAK_TIMEZONE = ZoneInfo(os.getenv("STREAK_TIMEZONE", "UTC"))
+
+
+def _local_midnight_utc(day: date):
+    # last_lesson_date is a naive UTC column
+    return datetime.combine(day, time.min, tzinfo=STREAK_TIMEZONE).astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def day_bounds(now=None):
+    """(now, start of today, start of yesterday), all naive UTC."""
+    now = now or datetime.now(timezone.utc)
+    today = now.astimezone(STREAK_TIMEZONE).date()
+    return (
+        now.astimezone(timezone.utc).replace(tzinfo=None),
+        _local_midnight_utc(today),
+        _local_midnight_utc(today - timedelta(days=1)),
+    )
+
+
+def streak_columns(now=None):
+    """(insert values, ON CONFLICT update expressions) that record a lesson now.
+
+    Folded into the XP upsert, so the streak costs no extra statement. The update
+    expressions see the row's previous values, as SET does in both Postgres and SQLite.
+    """
+    now, today_start, yesterday_start = day_bounds(now)
+    current = func.coalesce(UserProgress.streak_count, 0)
+    new_streak = case(
+        # Already counted today
+        ((UserProgress.last_lesson_date >= today_start) & (current > 0), current),
+        # Continues yesterday's streak
+        (UserProgress.last_lesson_date >= yesterday_start, current + 1),
+        else_=1
+    )
+    return (
+        {"streak_count": 1, "last_lesson_date": now},
+        {"streak_count": new_streak, "last_lesson_date": now},
+    )
+
+
+def reset_broken_streaks_statement(now=None):
+    """One set-based UPDATE zeroing every streak whose last lesson was before yesterday."""
+    _, _, yesterday_start = day_bounds(now)
+    return (
+        update(UserProgress)
+        .where(UserProgress.streak_count > 0)
+        .where(or_(UserProgress.last_lesson_date.is_(None), UserProgress.last_lesson_date < yesterday_start))
+        .values(streak_count=0)
+    )
@@ -0,0 +1,130 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import logging
+import os
+import secrets
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import Header, HTTPException
+from sqlalchemy import select
+
+import config  # noqa: F401  (loads .env before any setting below is read)
+
+logger = logging.getLogger(__name__)
+
+# ⚙️ Token settings
+TOKEN_SECRET = os.getenv("TOKEN_SECRET")
+TOKEN_TTL_SECONDS = int(os.getenv("TOKEN_TTL_SECONDS", str(7 * 24 * 3600)))
+REVOCATION_REFRESH_SECONDS = int(os.getenv("REVOCATION_REFRESH_SECONDS", "30"))
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+if not TOKEN_SECRET:
+    # Fine for local runs; with several workers every one would reject the others' tokens
+    logger.warning("TOKEN_SECRET is not set, using a random per-process secret")
+    TOKEN_SECRET = secrets.token_hex(32)
+
+_key = TOKEN_SECRET.encode()
+
+
+def _sign(payload: str) -> str:
+    digest = hmac.new(_key, payload.encode(), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).decode().rstrip("=")
+
+
+def issue_token(user_id: int, ttl: int = TOKEN_TTL_SECONDS) -> str:
+    """`<user_id>.<expires_at>.<jti>.<hmac>` -- verifiable without touching the database."""
+    payload = f"{user_id}.{int(time.time()) + ttl}.{secrets.token_hex(8)}"
+    return f"{payload}.{_sign(payload)}"
+
+
+class TokenError(Exception):
+    pass
+
+
+class RevocationList:
+    """Revoked token ids (jti -> expiry), held in memory and refreshed from revoked_tokens."""
+
+    def __init__(self):
+        self._revoked = {}
+
+    def revoke(self, jti: str, expires_at: int):
+        self._revoked[jti] = expires_at
+
+    def __contains__(self, jti):
+        return jti in self._revoked
+
+    def replace(self, entries):
+        now = time.time()
+        self._revoked = {jti: exp for jti, exp in entries if exp > now}
+
+
+revocations = RevocationList()
+
+
+def decode_token(token: str):
+    """Returns (user_id, expires_at, jti) or raises TokenError."""
+    try:
+        user_id, expires_at, jti, signature = token.split(".")
+    except ValueError:
+        raise TokenError("Malformed token.")
+    if not hmac.compare_digest(signature, _sign(f"{user_id}.{expires_at}.{jti}")):
+        raise TokenError("Invalid token signature.")
+    if int(expires_at) < time.time():
+        raise TokenError("Token expired.")
+    if jti in revocations:
+        raise TokenError("Token revoked.")
+    return int(user_id), int(expires_at), jti
+
+
+def bearer_token(authorization: Optional[str]) -> str:
+    if not authorization or not authorization.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="Missing bearer token.", headers={"WWW-Authenticate": "Bearer"})
+    return authorization[len("Bearer "):]
+
+
+async def current_token(authorization: Optional[str] = Header(None)):
+    try:
+        return decode_token(bearer_token(authorization))
+    except TokenError as e:
+        raise HTTPException(status_code=401, detail=str(e), headers={"WWW-Authenticate": "Bearer"})
+
+
+async def require_user(user_id: int, authorization: Optional[str] = Header(None)):
+    """Router dependency: the bearer token must belong to the `{user_id}` in the path."""
+    token_user_id, _, _ = await current_token(authorization)
+    if token_user_id != user_id:
+        raise HTTPException(status_code=403, detail="Token does not match this user.")
+    return token_user_id
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Admin router dependency; the admin API is disabled unless ADMIN_TOKEN is set."""
+    if not ADMIN_TOKEN or not x_admin_token or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Admin token required.")
+
+
+async def load_revocations():
+    # Imported here so tokens.py stays importable without a database
+    from models import RevokedToken
+    from sessions import unit_of_work
+
+    async with unit_of_work(read_only=True) as db:
+        result = await db.execute(
+            select(RevokedToken.jti, RevokedToken.expires_at)
+            .where(RevokedToken.expires_at > datetime.now(timezone.utc))
+        )
+        revocations.replace((jti, expires_at.timestamp()) for jti, expires_at in result)
+
+
+async def refresh_revocations_forever():
+    """Background task: picks up logouts made on other workers."""
+    while True:
+        try:
+            await load_revocations()
+        except Exception:
+            logger.exception("Refreshing revoked tokens failed")
+        await asyncio.sleep(REVOCATION_REFRESH_SECONDS)